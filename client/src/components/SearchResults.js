@@ -4,6 +4,10 @@ import { useAuth } from '../contexts/AuthContext';
 import { gamesAPI } from '../services/api';
 import axios from 'axios';
 
+// Giant Bomb results that may not be cached yet carry Giant Bomb's numeric id,
+// not ours; dropping it sends Add through add-external, which caches the game
+const asExternalResult = ({ id, ...game }) => game;
+
 const SearchResults = () => {
   const [searchParams] = useSearchParams();
   const [games, setGames] = useState([]);
@@ -110,8 +114,14 @@ const SearchResults = () => {
               // Cache the API results to local database
               try {
                 console.log(`Caching ${searchResults.length} games to local database...`);
-                const cacheResponse = await gamesAPI.cacheSearchResults(searchResults);
-                if (cacheResponse.success) {
+                const cacheResponse = await gamesAPI.cacheSearchResults(searchResults, { background: true });
+                if (cacheResponse.success && cacheResponse.job_id) {
+                  // Cached in the background; show the API results right away
+                  console.log(`Queued ${searchResults.length} games for caching (job ${cacheResponse.job_id})`);
+                  const existingGuids = new Set(localGames.map(game => game.guid));
+                  const newGames = searchResults.filter(game => !existingGuids.has(game.guid)).map(asExternalResult);
+                  combinedResults = [...combinedResults, ...newGames];
+                } else if (cacheResponse.success) {
                   console.log(`Successfully cached ${cacheResponse.cached_count} games`);
                   
                   // Add new cached games to combined results, avoiding duplicates
@@ -122,14 +132,14 @@ const SearchResults = () => {
                   console.warn('Failed to cache results, using API results directly');
                   // Add API results directly, avoiding duplicates
                   const existingGuids = new Set(localGames.map(game => game.guid));
-                  const newGames = searchResults.filter(game => !existingGuids.has(game.guid));
+                  const newGames = searchResults.filter(game => !existingGuids.has(game.guid)).map(asExternalResult);
                   combinedResults = [...combinedResults, ...newGames];
                 }
               } catch (cacheError) {
                 console.error('Error caching results:', cacheError);
                 // Fall back to using API results directly, avoiding duplicates
                 const existingGuids = new Set(localGames.map(game => game.guid));
-                const newGames = searchResults.filter(game => !existingGuids.has(game.guid));
+                const newGames = searchResults.filter(game => !existingGuids.has(game.guid)).map(asExternalResult);
                 combinedResults = [...combinedResults, ...newGames];
               }
             }
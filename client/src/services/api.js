@@ -58,8 +58,15 @@ export const authAPI = {
 };
 
 export const gamesAPI = {
-  getUserLibrary: async () => {
-    const response = await api.get('/games/library');
+  getUserLibrary: async (params = {}) => {
+    const response = await api.get('/games/library', { params });
+    return response.data;
+  },
+
+  // Rows changed and entries removed since a sync_token from an earlier response (0 = everything);
+  // a 410 means the token is too old and the client must sync again from 0
+  getLibraryChanges: async (since = 0, params = {}) => {
+    const response = await api.get('/games/library/changes', { params: { ...params, since } });
     return response.data;
   },
 
@@ -87,6 +94,18 @@ export const gamesAPI = {
     return response.data;
   },
 
+  // Whole library as a downloadable file; format is 'csv' or 'ndjson'
+  exportLibrary: async (format = 'csv') => {
+    const response = await api.get('/games/library/export', { params: { format }, responseType: 'blob' });
+    return response.data;
+  },
+
+  // operations: [{ op: 'add' | 'update' | 'remove', ... }], applied in one transaction
+  batchUpdateLibrary: async (operations, { atomic = false } = {}) => {
+    const response = await api.post('/games/library/batch', { operations, atomic });
+    return response.data;
+  },
+
   searchLocalGames: async (query, limit = 10) => {
     const response = await api.get(`/games/search?q=${encodeURIComponent(query)}&limit=${limit}`);
     return response.data;
@@ -97,8 +116,13 @@ export const gamesAPI = {
     return response.data;
   },
 
-  cacheSearchResults: async (searchResults) => {
-    const response = await api.post('/games/cache-search-results', { results: searchResults });
+  // With background: true the server queues the results and replies 202 with a job_id
+  cacheSearchResults: async (searchResults, { background = false } = {}) => {
+    const response = await api.post(
+      '/games/cache-search-results',
+      { results: searchResults },
+      background ? { params: { async: true } } : undefined
+    );
     return response.data;
   }
 };
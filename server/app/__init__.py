@@ -19,6 +19,10 @@ bcrypt = Bcrypt()
 def create_app():
     app = Flask(__name__)
     
+    # Queue-based structured logging (request threads never block on log I/O)
+    from app.utils.app_logging import configure_logging
+    configure_logging(app)
+    
     # Add ProxyFix to handle headers from load balancer
     app.wsgi_app = ProxyFix(app.wsgi_app, x_for=1, x_proto=1, x_host=1, x_port=1)
     
@@ -85,6 +89,10 @@ def create_app():
     app.after_request(add_rate_limit_headers)
     app.after_request(add_security_headers)
     
+    # Register maintenance CLI commands (flask <command>)
+    from app.commands import register_commands
+    register_commands(app)
+    
     # Create database tables
     with app.app_context():
         db.create_all()
@@ -95,5 +103,26 @@ def create_app():
             check_and_run_platform_migration(app, db)
         except Exception as e:
             print(f"Platform migration check failed: {e}")
+        
+        # Add columns introduced after the tables were first created
+        from .auto_migrate_columns import check_and_add_missing_columns
+        check_and_add_missing_columns(app, db)
+        
+        # Background workers for asynchronous search-result caching
+        from app.utils.job_queue import ingest_queue
+        ingest_queue.init_app(app)
+        
+        # Build or verify the game text search index
+        from app.utils.search_index import search_index
+        search_index.init_app(app)
+        
+        # Load in-memory autocomplete and fuzzy search indexes for game names and aliases
+        try:
+            from app.utils.autocomplete import autocomplete_index
+            from app.utils.fuzzy_index import fuzzy_index
+            autocomplete_index.load_from_db()
+            fuzzy_index.load_from_db()
+        except Exception as e:
+            print(f"Game name index load failed: {e}")
     
     return app
@@ -0,0 +1,190 @@
+"""
+Auto-migration for columns and indexes added to existing tables.
+db.create_all() only creates missing tables, so columns added to models later
+are added here on startup (nullable, no backfill; see the migrate_*.py scripts).
+Legacy image URL columns are the exception: they are converted to
+games.image_path by the first worker to start (once per database, recorded in
+startup_migrations) so covers keep showing before compact-game-images drops
+them.
+"""
+
+import logging
+from datetime import datetime
+from sqlalchemy import bindparam, inspect, text
+from sqlalchemy.exc import IntegrityError
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+# table -> {column: DDL type}
+ADDED_COLUMNS = {
+    'games': {
+        'release_year': 'INTEGER',
+        'image_path': 'VARCHAR(255)',
+        'image_overrides': 'JSON'
+    },
+    'user_games': {
+        'change_seq': 'BIGINT'
+    },
+    'user_library_versions': {
+        'pruned_seq': 'BIGINT'
+    }
+}
+
+# (index name, table, columns)
+ADDED_INDEXES = [
+    ('ix_games_release_year', 'games', 'release_year'),
+    ('ix_user_games_user_status_added', 'user_games', 'user_id, status, date_added'),
+    ('ix_user_games_user_added', 'user_games', 'user_id, date_added'),
+    ('ix_user_games_user_rating', 'user_games', 'user_id, rating'),
+    ('ix_user_games_user_hours', 'user_games', 'user_id, hours_played'),
+    ('ix_user_games_user_platform', 'user_games', 'user_id, platform_id'),
+    ('ix_user_games_user_change_seq', 'user_games', 'user_id, change_seq'),
+    ('ix_user_game_tombstones_deleted_at', 'user_game_tombstones', 'deleted_at')
+]
+
+# Legacy per-size image columns, in app.utils.images.IMAGE_SIZES key order
+LEGACY_IMAGE_COLUMNS = {
+    'medium_url': 'image_url',
+    'thumb_url': 'thumb_url',
+    'icon_url': 'icon_url',
+    'small_url': 'small_url',
+    'super_url': 'super_url',
+    'screen_url': 'screen_url',
+    'screen_large_url': 'screen_large_url',
+    'tiny_url': 'tiny_url'
+}
+
+def legacy_image_columns(db):
+    """{image dict key: column} for the legacy image columns games still has"""
+    columns = {column['name'] for column in inspect(db.engine).get_columns('games')}
+    return {key: column for key, column in LEGACY_IMAGE_COLUMNS.items() if column in columns}
+
+def convert_legacy_image_columns(db, batch_size=1000, progress=None):
+    """
+    Fill image_path / image_overrides from the legacy URL columns for games
+    that haven't been converted yet, committing per batch. Returns the number
+    of games converted.
+    """
+    from app.models import Game
+    from app.utils.images import compact_image_urls
+    
+    legacy = legacy_image_columns(db)
+    if not legacy:
+        return 0
+    
+    update = Game.__table__.update().where(Game.__table__.c.id == bindparam('game_id')).values(
+        image_path=bindparam('path'), image_overrides=bindparam('overrides')
+    )
+    has_legacy_url = ' OR '.join(f'{column} IS NOT NULL' for column in legacy.values())
+    last_id = 0
+    converted = 0
+    while True:
+        rows = db.session.execute(text(
+            f"SELECT id, {', '.join(legacy.values())} FROM games "
+            f"WHERE id > :last_id AND image_path IS NULL AND image_overrides IS NULL AND ({has_legacy_url}) "
+            "ORDER BY id LIMIT :batch_size"
+        ), {'last_id': last_id, 'batch_size': batch_size}).all()
+        if not rows:
+            break
+        
+        params = []
+        for row in rows:
+            image_path, image_overrides = compact_image_urls(dict(zip(legacy, row[1:])))
+            if image_path or image_overrides:
+                params.append({'game_id': row[0], 'path': image_path, 'overrides': image_overrides})
+        if params:
+            db.session.execute(update, params)
+        db.session.commit()
+        
+        converted += len(params)
+        last_id = rows[-1][0]
+        if progress:
+            progress(converted, last_id)
+    return converted
+
+STARTUP_MIGRATIONS_DDL = """
+    CREATE TABLE IF NOT EXISTS startup_migrations (
+        name VARCHAR(100) PRIMARY KEY,
+        completed_at TIMESTAMP
+    )
+"""
+
+def _startup_migration_done(db, name):
+    return db.session.execute(
+        text("SELECT 1 FROM startup_migrations WHERE name = :name"), {'name': name}
+    ).first() is not None
+
+def run_startup_migration_once(db, name, migrate):
+    """
+    Run migrate() unless it already completed for this database. On PostgreSQL
+    workers starting together take an advisory lock, and those that don't get
+    it skip the migration (the lock holder does it). Returns whether it ran.
+    """
+    db.session.execute(text(STARTUP_MIGRATIONS_DDL))
+    db.session.commit()
+    if _startup_migration_done(db, name):
+        return False
+    
+    # Held on its own connection: migrate() commits, which releases the session's
+    with db.engine.connect() as lock_connection:
+        if db.engine.dialect.name == 'postgresql':
+            acquired = lock_connection.execute(
+                text("SELECT pg_try_advisory_lock(hashtext(:name))"), {'name': name}
+            ).scalar()
+            if not acquired:
+                logger.info(f"Startup migration {name} is running in another worker")
+                return False
+        try:
+            # Another worker may have finished it while this one waited
+            if _startup_migration_done(db, name):
+                return False
+            migrate()
+            db.session.execute(
+                text("INSERT INTO startup_migrations (name, completed_at) VALUES (:name, :now)"),
+                {'name': name, 'now': datetime.utcnow()}
+            )
+            db.session.commit()
+        except IntegrityError:
+            # Recorded concurrently (SQLite has no advisory lock); the work is idempotent
+            db.session.rollback()
+        finally:
+            if db.engine.dialect.name == 'postgresql':
+                lock_connection.execute(text("SELECT pg_advisory_unlock(hashtext(:name))"), {'name': name})
+    return True
+
+def _convert_legacy_images_on_startup(db):
+    converted = convert_legacy_image_columns(db)
+    if converted:
+        logger.info(f"Converted legacy image columns for {converted} games")
+
+def check_and_add_missing_columns(app, db):
+    """Add any model columns/indexes that are missing from existing tables"""
+    try:
+        inspector = inspect(db.engine)
+        existing_tables = set(inspector.get_table_names())
+        
+        for table, columns in ADDED_COLUMNS.items():
+            if table not in existing_tables:
+                continue
+            existing_columns = {column['name'] for column in inspector.get_columns(table)}
+            for column_name, column_type in columns.items():
+                if column_name not in existing_columns:
+                    logger.info(f"Adding {table}.{column_name} column...")
+                    db.session.execute(text(f"ALTER TABLE {table} ADD COLUMN {column_name} {column_type}"))
+        
+        for index_name, table, columns in ADDED_INDEXES:
+            db.session.execute(text(f"CREATE INDEX IF NOT EXISTS {index_name} ON {table} ({columns})"))
+        
+        db.session.commit()
+        
+        run_startup_migration_once(db, 'compact_game_images', lambda: _convert_legacy_images_on_startup(db))
+        return True
+        
+    except Exception as e:
+        logger.error(f"Column migration failed: {e}")
+        try:
+            db.session.rollback()
+        except:
+            pass
+        return False
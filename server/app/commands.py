@@ -0,0 +1,255 @@
+"""
+Maintenance commands, run with the Flask CLI, e.g.
+
+    FLASK_APP=application.py flask backfill-game-tags
+    FLASK_APP=application.py flask import-games games_dump.json
+    FLASK_APP=application.py flask move-game-descriptions
+    FLASK_APP=application.py flask compact-game-images
+    FLASK_APP=application.py flask rebuild-library-stats
+    FLASK_APP=application.py flask prune-library-tombstones --days 90
+"""
+
+import json
+import os
+from datetime import datetime, timedelta
+
+import click
+from sqlalchemy import bindparam, inspect, text
+from app import db
+
+def register_commands(app):
+    """Attach maintenance commands to the app's CLI"""
+    app.cli.add_command(backfill_game_tags)
+    app.cli.add_command(import_games)
+    app.cli.add_command(move_game_descriptions)
+    app.cli.add_command(compact_game_images)
+    app.cli.add_command(rebuild_library_stats)
+    app.cli.add_command(prune_library_tombstones)
+
+@click.command('backfill-game-tags')
+@click.option('--batch-size', default=500, show_default=True, help='Games per transaction')
+def backfill_game_tags(batch_size):
+    """Populate game_tags and games.release_year from existing Game rows"""
+    from app.models import Game, GameTag
+
+    last_id = 0
+    processed = 0
+    tag_count = 0
+    while True:
+        games = Game.query.options(*Game.load_options(
+            ('id', 'original_release_date', 'expected_release_year') + tuple(GameTag.KINDS)
+        )).filter(Game.id > last_id).order_by(Game.id).limit(batch_size).all()
+        if not games:
+            break
+
+        game_ids = [game.id for game in games]
+        GameTag.query.filter(GameTag.game_id.in_(game_ids)).delete(synchronize_session=False)
+
+        tag_rows = []
+        for game in games:
+            game.release_year = Game.derive_release_year(game.original_release_date, game.expected_release_year)
+            tag_rows.extend(GameTag.rows_for_game(game))
+        if tag_rows:
+            db.session.execute(GameTag.__table__.insert(), tag_rows)
+        db.session.commit()
+
+        processed += len(games)
+        tag_count += len(tag_rows)
+        last_id = game_ids[-1]
+        click.echo(f"Backfilled {processed} games ({tag_count} tags)")
+
+    click.echo(f"Done: {processed} games, {tag_count} tags")
+
+def _read_checkpoint(path, dump_size):
+    """Offset and record count to resume from, or (0, 0) for a fresh import"""
+    if not os.path.exists(path):
+        return 0, 0
+    with open(path) as handle:
+        checkpoint = json.load(handle)
+    if checkpoint.get('size') != dump_size:
+        raise click.ClickException(
+            f"{path} was written for a different version of the dump; rerun with --restart"
+        )
+    return checkpoint['offset'], checkpoint['records']
+
+def _write_checkpoint(path, offset, records, dump_size):
+    # Write then rename so an interrupted write never leaves a corrupt checkpoint
+    temp_path = f'{path}.tmp'
+    with open(temp_path, 'w') as handle:
+        json.dump({'offset': offset, 'records': records, 'size': dump_size}, handle)
+    os.replace(temp_path, path)
+
+@click.command('import-games')
+@click.argument('dump_file', type=click.Path(exists=True, dir_okay=False))
+@click.option('--batch-size', default=1000, show_default=True, help='Games per transaction')
+@click.option('--checkpoint', 'checkpoint_path', default=None, help='Checkpoint file [default: DUMP_FILE.checkpoint]')
+@click.option('--restart', is_flag=True, help='Ignore an existing checkpoint and import from the start')
+def import_games(dump_file, batch_size, checkpoint_path, restart):
+    """
+    Import or refresh games from a Giant Bomb games dump (an API envelope
+    with a "results" array). The file is parsed incrementally and progress is
+    checkpointed after every batch, so rerunning an interrupted import resumes
+    after the last committed batch. Running servers pick up imported games in
+    their search indexes on restart.
+    """
+    from app.routes.games import cache_games_bulk
+    from app.utils.giantbomb_dump import DumpFormatError, iter_dump_results
+
+    checkpoint_path = checkpoint_path or f'{dump_file}.checkpoint'
+    dump_size = os.path.getsize(dump_file)
+    if restart and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    offset, records = _read_checkpoint(checkpoint_path, dump_size)
+    if offset:
+        click.echo(f"Resuming after {records} records (byte {offset})")
+
+    totals = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'skipped': 0}
+
+    def flush(batch, end_offset):
+        _, counts = cache_games_bulk(batch, reindex=False)
+        for key, value in counts.items():
+            totals[key] += value
+        totals['skipped'] += len(batch) - sum(counts.values())
+        _write_checkpoint(checkpoint_path, end_offset, records, dump_size)
+        click.echo(
+            f"{records} records: {totals['inserted']} inserted, {totals['updated']} updated, "
+            f"{totals['unchanged']} unchanged, {totals['skipped']} skipped"
+        )
+
+    batch = []
+    end_offset = offset
+    try:
+        for record, end_offset in iter_dump_results(dump_file, offset=offset):
+            batch.append(record)
+            records += 1
+            if len(batch) >= batch_size:
+                flush(batch, end_offset)
+                batch = []
+        if batch:
+            flush(batch, end_offset)
+    except DumpFormatError as e:
+        raise click.ClickException(f"{dump_file}: {e}")
+
+    if os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    click.echo(f"Done: {records} records imported from {dump_file}")
+
+@click.command('move-game-descriptions')
+@click.option('--batch-size', default=200, show_default=True, help='Games per transaction')
+@click.option('--drop-column', is_flag=True, help='Drop games.description once every row has been moved')
+def move_game_descriptions(batch_size, drop_column):
+    """Move descriptions from the legacy games.description column into game_descriptions"""
+    from app.models import GameDescription
+
+    columns = {column['name'] for column in inspect(db.engine).get_columns('games')}
+    if 'description' not in columns:
+        click.echo("games.description does not exist; nothing to move")
+        return
+
+    last_id = 0
+    moved = 0
+    while True:
+        rows = db.session.execute(text(
+            "SELECT id, description FROM games WHERE id > :last_id AND description IS NOT NULL "
+            "ORDER BY id LIMIT :batch_size"
+        ), {'last_id': last_id, 'batch_size': batch_size}).all()
+        if not rows:
+            break
+
+        game_ids = [game_id for game_id, _ in rows]
+        # Descriptions written since the upgrade are newer than the legacy copy
+        already_moved = GameDescription.stored_hashes(game_ids)
+        description_rows = [
+            row for row in (
+                GameDescription.row_for(game_id, description)
+                for game_id, description in rows if game_id not in already_moved
+            ) if row is not None
+        ]
+        if description_rows:
+            db.session.execute(GameDescription.__table__.insert(), description_rows)
+        db.session.execute(
+            text("UPDATE games SET description = NULL WHERE id IN :game_ids").bindparams(
+                bindparam('game_ids', expanding=True)
+            ),
+            {'game_ids': game_ids}
+        )
+        db.session.commit()
+
+        moved += len(description_rows)
+        last_id = game_ids[-1]
+        click.echo(f"Moved {moved} descriptions (through game {last_id})")
+
+    if drop_column:
+        db.session.execute(text("ALTER TABLE games DROP COLUMN description"))
+        db.session.commit()
+        click.echo("Dropped games.description")
+
+    click.echo(f"Done: {moved} descriptions moved")
+
+@click.command('compact-game-images')
+@click.option('--batch-size', default=1000, show_default=True, help='Games per transaction')
+@click.option('--drop-columns', is_flag=True, help='Drop the legacy URL columns once every row has been converted')
+def compact_game_images(batch_size, drop_columns):
+    """Convert the legacy per-size image URL columns to games.image_path / image_overrides"""
+    from app.auto_migrate_columns import convert_legacy_image_columns, legacy_image_columns
+
+    legacy = legacy_image_columns(db)
+    if not legacy:
+        click.echo("Legacy image columns do not exist; nothing to convert")
+    else:
+        converted = convert_legacy_image_columns(
+            db, batch_size,
+            progress=lambda converted, last_id: click.echo(f"Converted {converted} games (through game {last_id})")
+        )
+        click.echo(f"Done: {converted} games converted")
+
+    if drop_columns:
+        for column in legacy.values():
+            db.session.execute(text(f"ALTER TABLE games DROP COLUMN {column}"))
+        user_game_columns = {column['name'] for column in inspect(db.engine).get_columns('user_games')}
+        if 'image_url' in user_game_columns:
+            db.session.execute(text("ALTER TABLE user_games DROP COLUMN image_url"))
+        db.session.commit()
+        click.echo("Dropped legacy image columns")
+
+@click.command('rebuild-library-stats')
+@click.option('--user-id', 'user_ids', type=int, multiple=True, help='Only rebuild these users (repeatable)')
+@click.option('--batch-size', default=500, show_default=True, help='Users per transaction')
+def rebuild_library_stats(user_ids, batch_size):
+    """Recompute user_library_stats from user_games (initial fill or drift repair)"""
+    from app.models import User, UserLibraryStats
+
+    if user_ids:
+        UserLibraryStats.rebuild(user_ids)
+        db.session.commit()
+        click.echo(f"Rebuilt library stats for {len(user_ids)} users")
+        return
+
+    last_id = 0
+    processed = 0
+    while True:
+        batch = [user_id for (user_id,) in db.session.query(User.id).filter(
+            User.id > last_id
+        ).order_by(User.id).limit(batch_size)]
+        if not batch:
+            break
+        UserLibraryStats.rebuild(batch)
+        db.session.commit()
+        processed += len(batch)
+        last_id = batch[-1]
+        click.echo(f"Rebuilt library stats for {processed} users")
+
+    click.echo(f"Done: {processed} users")
+
+@click.command('prune-library-tombstones')
+@click.option('--days', default=90, show_default=True, help='Keep removals made in the last DAYS days')
+def prune_library_tombstones(days):
+    """
+    Delete old library removal records. Clients whose sync token predates a
+    pruned removal get a 410 from /library/changes and resync from since=0.
+    """
+    from app.models import UserGameTombstone
+
+    pruned = UserGameTombstone.prune(datetime.utcnow() - timedelta(days=days))
+    db.session.commit()
+    click.echo(f"Pruned {pruned} tombstones older than {days} days")
@@ -1,5 +1,12 @@
 from app import db
 from datetime import datetime
+import hashlib
+import zlib
+from sqlalchemy import case, delete, func, inspect, literal, select, text, update
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import contains_eager, joinedload, load_only
+from app.utils import images
+from app.utils.db_dialect import upsert_insert
 from werkzeug.security import generate_password_hash, check_password_hash
 
 class User(db.Model):
@@ -91,7 +98,6 @@ class Game(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     guid = db.Column(db.String(50), unique=True, nullable=False, index=True)  # Giant Bomb GUID
     name = db.Column(db.String(255), nullable=False, index=True)
-    description = db.Column(db.Text, nullable=True)
     deck = db.Column(db.Text, nullable=True)  # Brief summary
     original_release_date = db.Column(db.String(20), nullable=True)
     expected_release_year = db.Column(db.Integer, nullable=True)
@@ -99,15 +105,9 @@ class Game(db.Model):
     expected_release_month = db.Column(db.Integer, nullable=True)
     expected_release_day = db.Column(db.Integer, nullable=True)
     
-    # Image URLs - Giant Bomb provides multiple sizes
-    image_url = db.Column(db.String(500), nullable=True)  # medium_url
-    thumb_url = db.Column(db.String(500), nullable=True)  # thumb_url
-    icon_url = db.Column(db.String(500), nullable=True)   # icon_url
-    small_url = db.Column(db.String(500), nullable=True)  # small_url
-    super_url = db.Column(db.String(500), nullable=True)  # super_url
-    screen_url = db.Column(db.String(500), nullable=True) # screen_url
-    screen_large_url = db.Column(db.String(500), nullable=True) # screen_large_url
-    tiny_url = db.Column(db.String(500), nullable=True)   # tiny_url
+    # Images - Giant Bomb path stem shared by every size (see app/utils/images.py)
+    image_path = db.Column(db.String(255), nullable=True)
+    image_overrides = db.Column(db.JSON(none_as_null=True), nullable=True)  # {size key: url} for URLs not matching the stem
     
     # Related data stored as JSON
     platforms = db.Column(db.JSON, nullable=True)  # Store as JSON array
@@ -137,11 +137,119 @@ class Game(db.Model):
     date_added = db.Column(db.String(30), nullable=True)  # Giant Bomb date_added
     date_last_updated = db.Column(db.String(30), nullable=True)  # Giant Bomb date_last_updated
     
+    # Derived from original_release_date / expected_release_year for indexed filtering
+    release_year = db.Column(db.Integer, nullable=True, index=True)
+    
     # Relationships
     user_games = db.relationship('UserGame', backref='game', lazy=True, cascade='all, delete-orphan')
-    
-    def to_dict(self):
-        """Convert game object to dictionary"""
+    tags = db.relationship('GameTag', backref='game', lazy=True, cascade='all, delete-orphan')
+    # Long-form HTML lives in its own table; only the detail endpoint loads it
+    description_record = db.relationship(
+        'GameDescription', uselist=False, lazy='raise', cascade='all, delete-orphan', passive_deletes=True
+    )
+    
+    # Columns read by each serialized field, so partial views can skip the rest
+    FIELD_COLUMNS = {
+        'id': ('id',),
+        'guid': ('guid',),
+        'name': ('name',),
+        'description': (),
+        'deck': ('deck',),
+        'original_release_date': ('original_release_date',),
+        'expected_release_year': ('expected_release_year',),
+        'expected_release_quarter': ('expected_release_quarter',),
+        'expected_release_month': ('expected_release_month',),
+        'expected_release_day': ('expected_release_day',),
+        'image': ('image_path', 'image_overrides'),
+        'platforms': ('platforms',),
+        'genres': ('genres',),
+        'developers': ('developers',),
+        'publishers': ('publishers',),
+        'franchises': ('franchises',),
+        'concepts': ('concepts',),
+        'themes': ('themes',),
+        'aliases': ('aliases',),
+        'site_detail_url': ('site_detail_url',),
+        'api_detail_url': ('api_detail_url',),
+        'number_of_user_reviews': ('number_of_user_reviews',),
+        'original_game_rating': ('original_game_rating',),
+        'date_added': ('date_added',),
+        'date_last_updated': ('date_last_updated',),
+        'release_year': ('release_year',),
+        'created_at': ('created_at',),
+        'updated_at': ('updated_at',)
+    }
+    
+    # Fields needed to render a game card (search hits, library and profile rows)
+    CARD_FIELDS = ('id', 'guid', 'name', 'deck', 'original_release_date', 'expected_release_year', 'image', 'platforms')
+    
+    @classmethod
+    def resolve_fields(cls, view=None, fields=None):
+        """
+        Resolve the `view` / `fields` request parameters to a tuple of field names.
+        Returns None for the full representation; raises ValueError on unknown input.
+        """
+        if fields:
+            requested = [field.strip() for field in fields.split(',') if field.strip()]
+            unknown = [field for field in requested if field not in cls.FIELD_COLUMNS]
+            if unknown:
+                raise ValueError(f"Unknown game fields: {', '.join(unknown)}")
+            # id and guid are always included so clients can link rows
+            return tuple(dict.fromkeys(['id', 'guid'] + requested))
+        if view in (None, '', 'full'):
+            return None
+        if view == 'card':
+            return cls.CARD_FIELDS
+        raise ValueError(f"Unknown view: {view}")
+    
+    @classmethod
+    def load_only_columns(cls, fields):
+        """Column attributes to pass to load_only() for the given fields"""
+        names = dict.fromkeys(column for field in fields for column in cls.FIELD_COLUMNS[field])
+        return [getattr(cls, name) for name in names]
+    
+    @classmethod
+    def load_options(cls, fields):
+        """Query options restricting a Game query to the columns the fields need"""
+        if fields is None:
+            return []
+        return [load_only(*cls.load_only_columns(fields))]
+    
+    @staticmethod
+    def derive_release_year(original_release_date, expected_release_year=None):
+        """Release year from Giant Bomb's date string, falling back to the expected year"""
+        if original_release_date and original_release_date[:4].isdigit():
+            return int(original_release_date[:4])
+        return expected_release_year
+    
+    def image_dict(self):
+        """Giant Bomb style image dictionary, or None if the game has no images"""
+        return images.expand_image_urls(self.image_path, self.image_overrides)
+    
+    def image_variant(self, key):
+        """URL of a single image size, e.g. 'medium_url' or 'thumb_url'"""
+        return images.image_url(self.image_path, self.image_overrides, key)
+    
+    @property
+    def description(self):
+        """Full HTML description if it was loaded with the game (see GameDescription), else None"""
+        record = self.__dict__.get('description_record')
+        if record is not None:
+            return record.text
+        return self.__dict__.get('_legacy_description')
+    
+    def load_legacy_description(self):
+        """
+        For a game loaded with its description_record but without one, fall
+        back to the legacy games.description column (until move-game-descriptions has run)
+        """
+        if 'description_record' in self.__dict__ and self.description_record is None:
+            self._legacy_description = GameDescription.legacy_text(self.id)
+    
+    def to_dict(self, fields=None):
+        """Convert game object to dictionary, optionally restricted to the given fields"""
+        if fields is not None:
+            return {field: self._serialize_field(field) for field in fields}
         return {
             'id': self.id,
             'guid': self.guid,
@@ -153,16 +261,7 @@ class Game(db.Model):
             'expected_release_quarter': self.expected_release_quarter,
             'expected_release_month': self.expected_release_month,
             'expected_release_day': self.expected_release_day,
-            'image': {
-                'medium_url': self.image_url,
-                'thumb_url': self.thumb_url,
-                'icon_url': self.icon_url,
-                'small_url': self.small_url,
-                'super_url': self.super_url,
-                'screen_url': self.screen_url,
-                'screen_large_url': self.screen_large_url,
-                'tiny_url': self.tiny_url
-            } if any([self.image_url, self.thumb_url, self.icon_url, self.small_url, self.super_url, self.screen_url, self.screen_large_url, self.tiny_url]) else None,
+            'image': self.image_dict(),
             'platforms': self.platforms,
             'genres': self.genres,
             'developers': self.developers,
@@ -177,13 +276,162 @@ class Game(db.Model):
             'original_game_rating': self.original_game_rating,
             'date_added': self.date_added,
             'date_last_updated': self.date_last_updated,
+            'release_year': self.release_year,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
     
+    def _serialize_field(self, field):
+        """Serialize a single field without touching columns other fields need"""
+        if field == 'image':
+            return self.image_dict()
+        value = getattr(self, field)
+        if isinstance(value, datetime):
+            return value.isoformat()
+        return value
+    
     def __repr__(self):
         return f'<Game {self.name}>'
 
+# Whether games still has the pre-GameDescription description column (checked on first use)
+_legacy_description_column = None
+
+class GameDescription(db.Model):
+    """
+    Giant Bomb's full HTML description of a game, zlib-compressed and kept out
+    of the games row so list queries don't read it
+    """
+    __tablename__ = 'game_descriptions'
+    
+    game_id = db.Column(db.Integer, db.ForeignKey('games.id', ondelete='CASCADE'), primary_key=True)
+    content = db.Column(db.LargeBinary, nullable=False)  # zlib-compressed UTF-8
+    content_hash = db.Column(db.String(40), nullable=False)  # SHA-1 of the uncompressed text
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    @staticmethod
+    def hash_text(text):
+        """Digest used to detect changed descriptions without decompressing"""
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
+    
+    @classmethod
+    def row_for(cls, game_id, text):
+        """Build a row dict for a description, or None if there is no text"""
+        if not text:
+            return None
+        return {
+            'game_id': game_id,
+            'content': zlib.compress(text.encode('utf-8'), 6),
+            'content_hash': cls.hash_text(text),
+            'updated_at': datetime.utcnow()
+        }
+    
+    @classmethod
+    def stored_hashes(cls, game_ids):
+        """Map of game id -> content_hash for the games that have a stored description"""
+        if not game_ids:
+            return {}
+        return dict(db.session.query(cls.game_id, cls.content_hash).filter(cls.game_id.in_(game_ids)).all())
+    
+    @staticmethod
+    def legacy_text(game_id):
+        """Description still stored in the legacy games.description column, or None"""
+        global _legacy_description_column
+        if _legacy_description_column is None:
+            _legacy_description_column = 'description' in {
+                column['name'] for column in inspect(db.engine).get_columns('games')
+            }
+        if not _legacy_description_column:
+            return None
+        try:
+            # Savepoint, so a failure doesn't expire the caller's loaded objects
+            with db.session.begin_nested():
+                return db.session.execute(
+                    text("SELECT description FROM games WHERE id = :game_id"), {'game_id': game_id}
+                ).scalar()
+        except DBAPIError:
+            # Dropped since it was checked (move-game-descriptions --drop-column)
+            _legacy_description_column = False
+            return None
+    
+    @property
+    def text(self):
+        """Decompressed description"""
+        return zlib.decompress(self.content).decode('utf-8')
+    
+    def __repr__(self):
+        return f'<GameDescription {self.game_id}>'
+
+class GameTag(db.Model):
+    """
+    Normalized copy of the related entities stored in Game's JSON columns
+    (platforms, genres, developers, ...), indexed for filtering and facet counts
+    """
+    __tablename__ = 'game_tags'
+    
+    # Game JSON column -> tag kind
+    KINDS = {
+        'platforms': 'platform',
+        'genres': 'genre',
+        'developers': 'developer',
+        'publishers': 'publisher',
+        'franchises': 'franchise',
+        'concepts': 'concept',
+        'themes': 'theme'
+    }
+    
+    id = db.Column(db.Integer, primary_key=True)
+    game_id = db.Column(db.Integer, db.ForeignKey('games.id'), nullable=False)
+    kind = db.Column(db.String(20), nullable=False)
+    ref = db.Column(db.String(50), nullable=False)  # Giant Bomb guid, or id when the payload has no guid
+    name = db.Column(db.String(255), nullable=True)
+    
+    __table_args__ = (
+        db.UniqueConstraint('game_id', 'kind', 'ref', name='unique_game_tag'),
+        db.Index('ix_game_tags_kind_ref_game', 'kind', 'ref', 'game_id'),
+    )
+    
+    @classmethod
+    def rows_for(cls, game_id, game_data):
+        """Build tag row dicts for a game from its Giant Bomb JSON arrays"""
+        rows = []
+        seen = set()
+        for column, kind in cls.KINDS.items():
+            for item in game_data.get(column) or []:
+                if not isinstance(item, dict):
+                    continue
+                ref = item.get('guid') or item.get('id')
+                if ref is None:
+                    continue
+                # Clipped to the column sizes so one odd tag can't fail a multi-row insert
+                ref = str(ref)[:50]
+                if (kind, ref) in seen:
+                    continue
+                seen.add((kind, ref))
+                name = item.get('name')
+                rows.append({
+                    'game_id': game_id,
+                    'kind': kind,
+                    'ref': ref,
+                    'name': str(name)[:255] if name not in (None, '') else None
+                })
+        return rows
+    
+    @classmethod
+    def rows_for_game(cls, game):
+        """Build tag row dicts from a Game's JSON columns"""
+        return cls.rows_for(game.id, {column: getattr(game, column) for column in cls.KINDS})
+    
+    def to_dict(self):
+        """Convert game tag to dictionary"""
+        return {
+            'kind': self.kind,
+            'ref': self.ref,
+            'name': self.name
+        }
+    
+    def __repr__(self):
+        return f'<GameTag {self.game_id} {self.kind}:{self.ref}>'
+
 class Platform(db.Model):
     __tablename__ = 'platforms'
     
@@ -254,16 +502,46 @@ class UserGame(db.Model):
     rating = db.Column(db.Integer, nullable=True)  # 1-10 rating
     review = db.Column(db.Text, nullable=True)
     hours_played = db.Column(db.Float, nullable=True)
-    image_url = db.Column(db.String(500), nullable=True)  # Store game image for quick access
     date_added = db.Column(db.DateTime, default=datetime.utcnow)
     date_started = db.Column(db.DateTime, nullable=True)
     date_completed = db.Column(db.DateTime, nullable=True)
-    
-    # Ensure user can't add same game twice
-    __table_args__ = (db.UniqueConstraint('user_id', 'game_id', name='unique_user_game'),)
-    
-    def to_dict(self):
-        """Convert user_game object to dictionary"""
+    # Library version at this row's last change (see UserLibraryVersion), for delta sync
+    change_seq = db.Column(db.BigInteger, nullable=True)
+    
+    # Ensure user can't add same game twice; the indexes back the library filters and sort keys
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'game_id', name='unique_user_game'),
+        db.Index('ix_user_games_user_status_added', 'user_id', 'status', 'date_added'),
+        db.Index('ix_user_games_user_added', 'user_id', 'date_added'),
+        db.Index('ix_user_games_user_rating', 'user_id', 'rating'),
+        db.Index('ix_user_games_user_hours', 'user_id', 'hours_played'),
+        db.Index('ix_user_games_user_platform', 'user_id', 'platform_id'),
+        db.Index('ix_user_games_user_change_seq', 'user_id', 'change_seq'),
+    )
+    
+    @staticmethod
+    def game_load_columns(game_fields):
+        """Game columns to load for library rows serialized with game_fields (image_url needs the image)"""
+        return Game.load_only_columns(tuple(game_fields) + ('image',))
+    
+    @staticmethod
+    def game_loader(game_fields=None, joined=False):
+        """
+        Load option fetching each row's game in the same query (a JOIN instead of
+        one query per row). Pass joined=True when the query already joins Game.
+        """
+        loader = contains_eager(UserGame.game) if joined else joinedload(UserGame.game, innerjoin=True)
+        if game_fields is not None:
+            loader = loader.load_only(*UserGame.game_load_columns(game_fields))
+        return loader
+    
+    @property
+    def image_url(self):
+        """Cover image for library views, derived from the game"""
+        return self.game.image_variant('medium_url') if self.game else None
+    
+    def to_dict(self, game_fields=None):
+        """Convert user_game object to dictionary (game_fields restricts the nested game)"""
         return {
             'id': self.id,
             'user_id': self.user_id,
@@ -277,14 +555,259 @@ class UserGame(db.Model):
             'date_added': self.date_added.isoformat() if self.date_added else None,
             'date_started': self.date_started.isoformat() if self.date_started else None,
             'date_completed': self.date_completed.isoformat() if self.date_completed else None,
-            'game': self.game.to_dict() if self.game else None,
-            'platform_id': self.platform_id
+            'game': self.game.to_dict(game_fields) if self.game else None,
+            'platform_id': self.platform_id,
+            'change_seq': self.change_seq
         }
     
     def __repr__(self):
         return f'<UserGame {self.user_id}:{self.game_id}>'
 
 
+class UserLibraryVersion(db.Model):
+    """Per-user counter bumped whenever anything shown in the user's library changes"""
+    __tablename__ = 'user_library_versions'
+    
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0)
+    pruned_seq = db.Column(db.BigInteger, nullable=True)  # Highest change_seq of a pruned tombstone
+    
+    @classmethod
+    def bump(cls, user_ids):
+        """
+        Increment the versions of the given users as part of the current
+        transaction. Returns {user_id: new version}; rows changed in the same
+        transaction should be stamped with it (UserGame.change_seq).
+        """
+        user_ids = sorted(set(user_ids))
+        if not user_ids:
+            return {}
+        insert = upsert_insert(cls)
+        if insert is not None:
+            return dict(cls._execute_increment(
+                insert.values([{'user_id': user_id, 'version': 1} for user_id in user_ids])
+            ).all())
+        # Other dialects: increment existing rows, then add the missing ones
+        db.session.execute(update(cls).where(cls.user_id.in_(user_ids)).values(version=cls.version + 1))
+        existing = set(db.session.scalars(select(cls.user_id).where(cls.user_id.in_(user_ids))))
+        missing = [{'user_id': user_id, 'version': 1} for user_id in user_ids if user_id not in existing]
+        if missing:
+            db.session.execute(cls.__table__.insert(), missing)
+        return cls.versions(user_ids)
+    
+    @classmethod
+    def bump_owners(cls, game_ids):
+        """
+        Increment the versions of every user with one of these games in their
+        library, and stamp those library rows with the new versions
+        """
+        if not game_ids:
+            return
+        owners = select(UserGame.user_id).where(UserGame.game_id.in_(list(game_ids))).group_by(UserGame.user_id)
+        insert = upsert_insert(cls)
+        if insert is not None:
+            # (SQLite needs the SELECT to end in something other than a table before ON CONFLICT)
+            new_rows = owners.add_columns(literal(1))
+            cls._execute_increment(insert.from_select(['user_id', 'version'], new_rows))
+        else:
+            cls.bump(db.session.scalars(owners))
+        db.session.execute(
+            update(UserGame).where(UserGame.game_id.in_(list(game_ids))).values(
+                change_seq=select(cls.version).where(cls.user_id == UserGame.user_id).scalar_subquery()
+            ).execution_options(synchronize_session=False)
+        )
+    
+    @classmethod
+    def _execute_increment(cls, insert):
+        return db.session.execute(insert.on_conflict_do_update(
+            index_elements=['user_id'], set_={'version': cls.version + 1}
+        ).returning(cls.user_id, cls.version))
+    
+    @classmethod
+    def versions(cls, user_ids):
+        """{user_id: version} for the given users (0 for users whose library never changed)"""
+        found = dict(db.session.execute(select(cls.user_id, cls.version).where(cls.user_id.in_(list(user_ids)))).all())
+        return {user_id: found.get(user_id, 0) for user_id in user_ids}
+    
+    @classmethod
+    def pruned_through(cls, user_id):
+        """Highest change_seq whose tombstone was pruned (sync tokens below it miss removals)"""
+        return db.session.scalar(select(cls.pruned_seq).where(cls.user_id == user_id)) or 0
+    
+    def __repr__(self):
+        return f'<UserLibraryVersion {self.user_id}:{self.version}>'
+
+
+class UserGameTombstone(db.Model):
+    """Record of a removed library entry, so delta sync can report the removal"""
+    __tablename__ = 'user_game_tombstones'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    user_game_id = db.Column(db.Integer, nullable=False)
+    game_id = db.Column(db.Integer, nullable=False)
+    change_seq = db.Column(db.BigInteger, nullable=False)
+    deleted_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        db.Index('ix_user_game_tombstones_user_change_seq', 'user_id', 'change_seq'),
+        db.Index('ix_user_game_tombstones_deleted_at', 'deleted_at'),
+    )
+    
+    @classmethod
+    def prune(cls, before):
+        """
+        Delete tombstones of entries removed before `before`, recording each
+        user's highest pruned change_seq so older sync tokens are refused.
+        Returns the number of tombstones deleted.
+        """
+        pruned_seq = select(func.max(cls.change_seq)).where(
+            cls.user_id == UserLibraryVersion.user_id, cls.deleted_at < before
+        ).scalar_subquery()
+        db.session.execute(
+            update(UserLibraryVersion).where(
+                UserLibraryVersion.user_id.in_(select(cls.user_id).where(cls.deleted_at < before))
+            ).values(pruned_seq=case(
+                (pruned_seq > func.coalesce(UserLibraryVersion.pruned_seq, 0), pruned_seq),
+                else_=UserLibraryVersion.pruned_seq
+            ))
+        )
+        return db.session.execute(delete(cls).where(cls.deleted_at < before)).rowcount
+    
+    def to_dict(self):
+        """Convert tombstone to dictionary"""
+        return {
+            'id': self.user_game_id,
+            'game_id': self.game_id,
+            'change_seq': self.change_seq,
+            'deleted_at': self.deleted_at.isoformat() if self.deleted_at else None
+        }
+    
+    def __repr__(self):
+        return f'<UserGameTombstone {self.user_id}:{self.user_game_id}>'
+
+
+class UserLibraryStats(db.Model):
+    """
+    Per-user library totals, kept up to date by the library write paths in the
+    same transaction as the change (rebuild with `flask rebuild-library-stats`)
+    """
+    __tablename__ = 'user_library_stats'
+    
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    total_games = db.Column(db.Integer, nullable=False, default=0)
+    want_to_play = db.Column(db.Integer, nullable=False, default=0)
+    playing = db.Column(db.Integer, nullable=False, default=0)
+    completed = db.Column(db.Integer, nullable=False, default=0)
+    collection = db.Column(db.Integer, nullable=False, default=0)
+    dropped = db.Column(db.Integer, nullable=False, default=0)
+    rating_sum = db.Column(db.Integer, nullable=False, default=0)
+    rating_count = db.Column(db.Integer, nullable=False, default=0)
+    hours_sum = db.Column(db.Float, nullable=False, default=0)
+    
+    STATUSES = ('want_to_play', 'playing', 'completed', 'collection', 'dropped')
+    COUNTERS = ('total_games',) + STATUSES + ('rating_sum', 'rating_count', 'hours_sum')
+    
+    @staticmethod
+    def snapshot(user_game):
+        """The values of a library row the stats depend on"""
+        return user_game.status, user_game.rating, user_game.hours_played
+    
+    @classmethod
+    def delta(cls, removed=(), added=()):
+        """Counter changes for library rows removed and added, given as snapshot() tuples"""
+        changes = dict.fromkeys(cls.COUNTERS, 0)
+        for sign, entries in ((-1, removed), (1, added)):
+            for status, rating, hours_played in entries:
+                changes['total_games'] += sign
+                if status in cls.STATUSES:
+                    changes[status] += sign
+                if rating is not None:
+                    changes['rating_sum'] += sign * rating
+                    changes['rating_count'] += sign
+                if hours_played is not None:
+                    changes['hours_sum'] += sign * hours_played
+        return {counter: change for counter, change in changes.items() if change}
+    
+    @classmethod
+    def apply(cls, user_id, changes):
+        """
+        Add the counter changes to the user's row in the current transaction.
+        Call once the library change itself is in the session: a user without
+        a row yet gets one computed from the library, which already includes it.
+        """
+        if not changes:
+            return
+        increment = update(cls).where(cls.user_id == user_id).values(
+            {counter: getattr(cls, counter) + change for counter, change in changes.items()}
+        )
+        if db.session.execute(increment).rowcount:
+            return
+        db.session.flush()
+        insert = upsert_insert(cls)
+        if insert is None:
+            cls.rebuild([user_id])
+            return
+        created = db.session.execute(
+            insert.from_select(['user_id'] + list(cls.COUNTERS), cls.aggregate_select([user_id])).on_conflict_do_nothing()
+        ).rowcount
+        if not created:
+            # Created concurrently from the committed library, which doesn't include this change yet
+            db.session.execute(increment)
+    
+    @classmethod
+    def aggregate_select(cls, user_ids=None):
+        """SELECT computing (user_id, *COUNTERS) from user_games, one row per user with games"""
+        def status_count(status):
+            return func.coalesce(func.sum(case((UserGame.status == status, 1), else_=0)), 0)
+        query = select(
+            UserGame.user_id,
+            func.count(UserGame.id),
+            *[status_count(status) for status in cls.STATUSES],
+            func.coalesce(func.sum(UserGame.rating), 0),
+            func.count(UserGame.rating),
+            func.coalesce(func.sum(UserGame.hours_played), 0.0)
+        )
+        if user_ids is not None:
+            query = query.where(UserGame.user_id.in_(list(user_ids)))
+        return query.group_by(UserGame.user_id)
+    
+    @classmethod
+    def rebuild(cls, user_ids=None):
+        """Recompute rows from user_games (all users, or just these) in the current transaction"""
+        stale = delete(cls)
+        if user_ids is not None:
+            stale = stale.where(cls.user_id.in_(list(user_ids)))
+        db.session.execute(stale)
+        db.session.execute(
+            cls.__table__.insert().from_select(['user_id'] + list(cls.COUNTERS), cls.aggregate_select(user_ids))
+        )
+    
+    @classmethod
+    def for_user(cls, user_id):
+        """Stats for one user; computed from the library if the user has no row yet"""
+        stats = db.session.get(cls, user_id)
+        if stats is not None:
+            return stats
+        row = db.session.execute(cls.aggregate_select([user_id])).first()
+        return cls(user_id=user_id, **dict(zip(cls.COUNTERS, row[1:] if row else [0] * len(cls.COUNTERS))))
+    
+    def to_dict(self):
+        """Stats in the format of the user profile"""
+        return {
+            'total_games': self.total_games,
+            'completed': self.completed,
+            'currently_playing': self.playing,
+            'want_to_play': self.want_to_play,
+            'collection': self.collection,
+            'dropped': self.dropped,
+            'average_rating': self.rating_sum / self.rating_count if self.rating_count else 0,
+            'total_hours': round(self.hours_sum, 2) if self.hours_sum else 0
+        }
+    
+    def __repr__(self):
+        return f'<UserLibraryStats {self.user_id}:{self.total_games}>'
+
 class Follow(db.Model):
     __tablename__ = 'follows'
     
@@ -66,6 +66,42 @@ def security_status():
             'message': f'Failed to get security status: {str(e)}'
         }), 500
 
+@admin_bp.route('/cache-status', methods=['GET'])
+@jwt_required()
+def cache_status():
+    """Get in-process search cache and index statistics (admin only)"""
+    try:
+        current_user_id = get_jwt_identity()
+        user = User.query.get(current_user_id)
+        
+        if not user:
+            return jsonify({'success': False, 'message': 'User not found'}), 404
+        
+        from app.routes.games import search_results_cache, search_flight, recent_cache_payloads
+        from app.utils.autocomplete import autocomplete_index
+        from app.utils.fuzzy_index import fuzzy_index
+        from app.utils.search_index import search_index
+        from app.utils.job_queue import ingest_queue
+        from app.utils.app_logging import logging_stats
+        
+        return jsonify({
+            'success': True,
+            'search_cache': search_results_cache.stats(),
+            'search_coalescing': search_flight.stats(),
+            'cache_payload_dedupe': recent_cache_payloads.stats(),
+            'autocomplete_games': len(autocomplete_index),
+            'fuzzy_index_games': len(fuzzy_index),
+            'search_backend': search_index.backend,
+            'ingest_queue': ingest_queue.stats(),
+            'logging': logging_stats()
+        }), 200
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Failed to get cache status: {str(e)}'
+        }), 500
+
 @admin_bp.route('/clear-suspicious-ips', methods=['POST'])
 @jwt_required()
 def clear_suspicious_ips():
@@ -6,18 +6,20 @@ from app import db, bcrypt
 from app.models import User
 from app.utils.rate_limiter import rate_limit, auth_limiter
 from app.utils.bot_protection import bot_protection
+import logging
 import re
 import time
 
 auth_bp = Blueprint('auth', __name__)
 
+logger = logging.getLogger(__name__)
+
 # Temporary test endpoint for debugging
 @auth_bp.route('/test-register', methods=['POST'])
 def test_register():
     """Test registration without bot protection for debugging"""
     try:
         json_data = request.get_json()
-        print(f"Test registration data: {json_data}")
         
         if not json_data:
             return jsonify({'success': False, 'message': 'No data provided'}), 400
@@ -33,14 +35,14 @@ def test_register():
         }), 200
         
     except ValidationError as e:
-        print(f"Test validation error: {e.messages}")
+        logger.info("Test registration validation error", extra={'errors': e.messages})
         return jsonify({
             'success': False,
             'message': 'Validation error',
             'errors': e.messages
         }), 400
     except Exception as e:
-        print(f"Test registration error: {str(e)}")
+        logger.exception("Test registration failed")
         return jsonify({
             'success': False,
             'message': 'Test failed',
@@ -108,10 +110,13 @@ def register():
         
         # Get form data
         json_data = request.get_json()
-        print(f"Registration attempt from {client_ip} with data: {json_data}")
+        logger.debug("Registration attempt", extra={
+            'client_ip': client_ip,
+            'username': json_data.get('username') if isinstance(json_data, dict) else None
+        })
         
         if not json_data:
-            print("No JSON data provided in registration request")
+            logger.info("Registration rejected: no data provided", extra={'client_ip': client_ip})
             return jsonify({
                 'success': False,
                 'message': 'No data provided'
@@ -123,7 +128,7 @@ def register():
         )
         
         if not is_valid:
-            print(f"Bot protection failed: {bot_errors}")
+            logger.warning("Registration blocked by bot protection", extra={'client_ip': client_ip, 'errors': bot_errors})
             return jsonify({
                 'success': False,
                 'message': 'Registration validation failed',
@@ -170,14 +175,14 @@ def register():
         return response
         
     except ValidationError as e:
-        print(f"Validation error in registration: {e.messages}")
+        logger.info("Registration validation error", extra={'errors': e.messages})
         return jsonify({
             'success': False,
             'message': 'Validation error',
             'errors': e.messages
         }), 400
     except Exception as e:
-        print(f"Registration error: {str(e)}")
+        logger.exception("Registration failed")
         db.session.rollback()
         return jsonify({
             'success': False,
@@ -1,105 +1,439 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from marshmallow import Schema, fields, ValidationError
 from app import db
-from app.models import Game, User, UserGame
-from sqlalchemy import or_
+from app.models import Game, GameDescription, GameTag, Platform, User, UserGame, UserGameTombstone, UserLibraryStats, UserLibraryVersion
+from app.utils.search_index import search_index, titles_matcher
+from app.utils.autocomplete import autocomplete_index
+from app.utils.fuzzy_index import fuzzy_index, fuzzy_titles_matcher
+from app.utils.ttl_cache import TTLCache
+from app.utils.single_flight import SingleFlight
+from app.utils.cursors import encode_cursor, decode_cursor
+from app.utils.db_dialect import rows_per_statement, upsert_insert
+from app.utils.images import compact_image_urls
+from app.utils.job_queue import ingest_queue, QueueFull
+from app.utils.etags import version_etag, not_modified, with_etag
+import csv
+import hashlib
+import io
+import json
+import logging
+import os
+from datetime import datetime
+from sqlalchemy import and_, delete, func, or_, select, update
+from sqlalchemy.orm import joinedload
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy.exc import IntegrityError
 
 games_bp = Blueprint('games', __name__)
 
+logger = logging.getLogger(__name__)
+
+# Result cache for local game searches, keyed on (normalized query, limit, fields, cursor, mode)
+search_results_cache = TTLCache(
+    max_entries=int(os.getenv('SEARCH_CACHE_SIZE', 2048)),
+    ttl_seconds=int(os.getenv('SEARCH_CACHE_TTL', 300))
+)
+
+# Concurrent identical searches in this worker share one database query
+search_flight = SingleFlight()
+
+# Recently processed cache-search-results payloads: digest -> {guid: serialized game}
+recent_cache_payloads = TTLCache(
+    max_entries=int(os.getenv('CACHE_PAYLOAD_DIGESTS', 512)),
+    ttl_seconds=int(os.getenv('CACHE_PAYLOAD_TTL', 600))
+)
+
+def payload_digest(search_results):
+    """Digest of a results payload from its sorted (guid, date_last_updated) pairs, or None if it has no games"""
+    versions = sorted({
+        (game_data['guid'], game_data.get('date_last_updated') or '')
+        for game_data in search_results if isinstance(game_data, dict) and game_data.get('guid')
+    })
+    if not versions:
+        return None
+    return hashlib.sha1(json.dumps(versions).encode('utf-8')).hexdigest()
+
+# Largest payload accepted for background caching (Giant Bomb pages hold up to 100)
+MAX_ASYNC_RESULTS = int(os.getenv('INGEST_MAX_RESULTS', 100))
+
+def invalidate_search_cache_for(titles):
+    """
+    Drop cached searches whose results games with these (name, aliases) titles
+    could change, in one pass over the cache for the whole batch
+    """
+    if not titles:
+        return 0
+    matchers = {'exact': titles_matcher(titles), 'fuzzy': fuzzy_titles_matcher(titles)}
+    verdicts = {}  # Many keys share a query (other pages, limits, fields)
+    
+    def affected(key):
+        query, mode = key[0], key[4]
+        if (query, mode) not in verdicts:
+            verdicts[(query, mode)] = matchers[mode](query)
+        return verdicts[(query, mode)]
+    return search_results_cache.invalidate_where(affected)
+
+def fuzzy_search_games(query, limit, fields=None):
+    """Typo-tolerant search: candidates from the trigram index, loaded in rank order"""
+    ranked_ids = [game_id for game_id, _ in fuzzy_index.search(query, limit)]
+    if not ranked_ids:
+        return []
+    games = Game.query.options(*Game.load_options(fields)).filter(Game.id.in_(ranked_ids)).all()
+    games_by_id = {game.id: game for game in games}
+    return [games_by_id[game_id] for game_id in ranked_ids if game_id in games_by_id]
+
+def game_columns_from_api_data(game_data):
+    """Map a Giant Bomb game payload to Game column values"""
+    # Image URLs are stored as a shared path stem plus any non-matching URLs
+    image_path, image_overrides = compact_image_urls(game_data.get('image'))
+    
+    return dict(
+        guid=game_data.get('guid'),
+        name=game_data.get('name'),
+        deck=game_data.get('deck'),
+        original_release_date=game_data.get('original_release_date'),
+        expected_release_year=game_data.get('expected_release_year'),
+        expected_release_quarter=game_data.get('expected_release_quarter'),
+        expected_release_month=game_data.get('expected_release_month'),
+        expected_release_day=game_data.get('expected_release_day'),
+        
+        # Images
+        image_path=image_path,
+        image_overrides=image_overrides,
+        
+        # JSON fields
+        platforms=game_data.get('platforms'),
+        genres=game_data.get('genres'),
+        developers=game_data.get('developers'),
+        publishers=game_data.get('publishers'),
+        franchises=game_data.get('franchises'),
+        concepts=game_data.get('concepts'),
+        themes=game_data.get('themes'),
+        
+        # Text fields
+        aliases=game_data.get('aliases'),
+        
+        # URLs
+        site_detail_url=game_data.get('site_detail_url'),
+        api_detail_url=game_data.get('api_detail_url'),
+        
+        # Metadata
+        number_of_user_reviews=game_data.get('number_of_user_reviews', 0),
+        original_game_rating=game_data.get('original_game_rating'),
+        
+        # Giant Bomb timestamps
+        date_added=game_data.get('date_added'),
+        date_last_updated=game_data.get('date_last_updated'),
+        
+        # Derived columns for indexed filtering
+        release_year=Game.derive_release_year(
+            game_data.get('original_release_date'),
+            game_data.get('expected_release_year')
+        )
+    )
+
+def clean_game_payload(game_data):
+    """
+    Check a Giant Bomb game payload against the Game column types, converting
+    numeric strings for integer columns. Returns a cleaned copy; raises
+    ValueError naming the offending field, so one bad game can be skipped
+    instead of failing the whole multi-row statement.
+    """
+    cleaned = dict(game_data)
+    table_columns = Game.__table__.columns
+    for key, value in game_data.items():
+        column = table_columns.get(key)
+        if column is None or value is None:
+            continue
+        if isinstance(column.type, db.String):
+            # Checked before deriving columns from them (e.g. release_year)
+            if not isinstance(value, str):
+                raise ValueError(f"{key} must be a string")
+        elif not isinstance(column.type, db.Integer):
+            continue
+        elif isinstance(value, str) and value.strip().lstrip('-').isdigit():
+            cleaned[key] = int(value)
+        elif isinstance(value, bool) or not isinstance(value, int):
+            raise ValueError(f"{key} must be an integer")
+    for key in GameTag.KINDS:
+        if cleaned.get(key) is not None and not isinstance(cleaned[key], list):
+            raise ValueError(f"{key} must be a list")
+    if cleaned.get('image') is not None:
+        if not isinstance(cleaned['image'], dict):
+            raise ValueError("image must be an object")
+        if any(url is not None and not isinstance(url, str) for url in cleaned['image'].values()):
+            raise ValueError("image URLs must be strings")
+    if cleaned.get('description') is not None and not isinstance(cleaned['description'], str):
+        raise ValueError("description must be a string")
+    
+    for name, value in game_columns_from_api_data(cleaned).items():
+        column_type = table_columns[name].type
+        if value is None:
+            if not table_columns[name].nullable:
+                raise ValueError(f"{name} is required")
+        elif isinstance(column_type, db.String):
+            if not isinstance(value, str):
+                raise ValueError(f"{name} must be a string")
+            if column_type.length and len(value) > column_type.length:
+                raise ValueError(f"{name} is longer than {column_type.length} characters")
+    return cleaned
+
+# Payload keys feeding columns whose name differs from the key
+COLUMN_SOURCES = {
+    'image_path': ('image',),
+    'image_overrides': ('image',),
+    'release_year': ('original_release_date', 'expected_release_year')
+}
+
+def payload_version(game, game_data):
+    """'stale', 'same' or 'newer' for a payload compared with the cached game's Giant Bomb revision"""
+    incoming_updated = game_data.get('date_last_updated')
+    stored_updated = game.date_last_updated
+    if incoming_updated and stored_updated:
+        if incoming_updated < stored_updated:
+            return 'stale'
+        if incoming_updated == stored_updated:
+            return 'same'
+    return 'newer'
+
+def changed_description(game, game_data, stored_hashes):
+    """
+    GameDescription row to write for a cached game, or None if the payload's
+    description is absent, stale or identical. stored_hashes maps game id to
+    the content_hash of its stored description.
+    """
+    row = GameDescription.row_for(game.id, game_data.get('description'))
+    version = payload_version(game, game_data)
+    if row is None or version == 'stale':
+        return None
+    stored_hash = stored_hashes.get(game.id)
+    if version == 'same' and stored_hash is not None:
+        return None  # Same revision: only fill a missing description
+    return row if stored_hash != row['content_hash'] else None
+
+def changed_game_columns(game, game_data):
+    """
+    Columns of a cached game that an incoming payload would change.
+    Only fields present in the payload are compared, so partial payloads
+    (Giant Bomb field_list subsets) never blank out stored data.
+    """
+    version = payload_version(game, game_data)
+    if version == 'stale':
+        return {}
+    same_version = version == 'same'
+    
+    changes = {}
+    for column, value in game_columns_from_api_data(game_data).items():
+        if column == 'guid' or not any(key in game_data for key in COLUMN_SOURCES.get(column, (column,))):
+            continue
+        current = getattr(game, column)
+        if same_version:
+            # Same Giant Bomb revision: only fill gaps left by a partial payload
+            if current is None and value is not None:
+                changes[column] = value
+        elif current != value:
+            changes[column] = value
+    return changes
+
+def index_cached_games(games, previous_titles=()):
+    """
+    Make new or refreshed games visible to autocomplete, fuzzy search and
+    cached searches. previous_titles are (name, aliases) pairs of renamed games.
+    """
+    for game in games:
+        autocomplete_index.add_game(game)
+        fuzzy_index.add_game(game)
+    invalidate_search_cache_for([(game.name, game.aliases) for game in games] + list(previous_titles))
+
+# db.session.info key for games cached with commit=False, indexed after the caller commits
+PENDING_GAME_INDEX = 'pending_game_index'
+
+def _index_cached_batch(games, previous_titles, refreshed):
+    # Make new and refreshed games visible to in-memory indexes immediately
+    index_cached_games(games, previous_titles)
+    if refreshed:
+        # Responses remembered for earlier payloads may show the old data
+        recent_cache_payloads.clear()
+
+def index_pending_games():
+    """Index games cached with commit=False; call after committing the transaction"""
+    for pending in db.session.info.pop(PENDING_GAME_INDEX, []):
+        _index_cached_batch(*pending)
+
+def discard_pending_games():
+    """Forget games cached with commit=False when their transaction is rolled back"""
+    db.session.info.pop(PENDING_GAME_INDEX, None)
+
 def cache_game_from_api_data(game_data):
     """
-    Cache a game from Giant Bomb API data to local database
+    Cache a game from Giant Bomb API data to local database, refreshing the
+    cached copy when the payload carries newer data
     Returns the Game object (existing or newly created)
     """
     try:
         if not game_data.get('guid'):
-            print("Warning: Game data missing GUID, skipping cache")
+            logger.warning("Game data missing GUID, skipping cache", extra={'game_name': game_data.get('name')})
             return None
+        
+        games_by_guid, _ = cache_games_bulk([game_data])
+        return games_by_guid.get(game_data['guid'])
+        
+    except Exception as e:
+        logger.exception("Error caching game", extra={'game_guid': game_data.get('guid')})
+        return None
+
+def cache_games_bulk(search_results, reindex=True, commit=True):
+    """
+    Cache a batch of Giant Bomb games with one lookup, one multi-row
+    INSERT ... ON CONFLICT (guid) DO NOTHING, an UPDATE of only the changed
+    columns for cached games with newer data, and one commit. Descriptions
+    are written compressed to game_descriptions.
+    reindex=False skips this process's in-memory search indexes (offline imports).
+    commit=False only flushes, so the writes join the caller's transaction; the
+    caller then commits and calls index_pending_games().
+    Returns ({guid: Game} for every payload entry with a GUID,
+             {'inserted': n, 'updated': n, 'unchanged': n, 'skipped': n}).
+    Payloads that don't fit the Game columns are logged and skipped.
+    """
+    counts = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'skipped': 0}
+    payload_by_guid = {}
+    for game_data in search_results:
+        guid = game_data.get('guid') if isinstance(game_data, dict) else None
+        if guid and guid not in payload_by_guid:
+            try:
+                payload_by_guid[guid] = clean_game_payload(game_data)
+            except (ValueError, TypeError, AttributeError) as e:
+                counts['skipped'] += 1
+                logger.warning("Skipping invalid game payload", extra={'game_guid': guid, 'error': str(e)})
+    if not payload_by_guid:
+        return {}, counts
+    
+    try:
+        games_by_guid = {
+            game.guid: game for game in Game.query.filter(Game.guid.in_(list(payload_by_guid))).all()
+        }
+        
+        # Stored description digests, so unchanged descriptions are not rewritten
+        stored_hashes = GameDescription.stored_hashes([
+            game.id for guid, game in games_by_guid.items() if payload_by_guid[guid].get('description')
+        ])
+        
+        # Refresh cached games whose payload differs; unchanged ones are not written
+        updated_games = []
+        previous_titles = []
+        retagged_ids = []
+        description_rows = []
+        for guid, game in games_by_guid.items():
+            changes = changed_game_columns(game, payload_by_guid[guid])
+            description_row = changed_description(game, payload_by_guid[guid], stored_hashes)
+            if not changes and description_row is None:
+                counts['unchanged'] += 1
+                continue
+            if description_row is not None:
+                description_rows.append(description_row)
+            if 'name' in changes or 'aliases' in changes:
+                previous_titles.append((game.name, game.aliases))
+            if any(column in changes for column in GameTag.KINDS):
+                retagged_ids.append(game.id)
+            for column, value in changes.items():
+                setattr(game, column, value)
+            updated_games.append(game)
+        counts['updated'] = len(updated_games)
+        if updated_games:
+            db.session.flush()
+        if retagged_ids:
+            GameTag.query.filter(GameTag.game_id.in_(retagged_ids)).delete(synchronize_session=False)
+        if description_rows:
+            GameDescription.query.filter(
+                GameDescription.game_id.in_([row['game_id'] for row in description_rows])
+            ).delete(synchronize_session=False)
+        
+        new_rows = [
+            game_columns_from_api_data(game_data)
+            for guid, game_data in payload_by_guid.items() if guid not in games_by_guid
+        ]
+        
+        new_games = []
+        if new_rows:
+            insert_stmt = upsert_insert(Game)
+            if insert_stmt is not None:
+                # Rows inserted concurrently by another request are skipped, not errors;
+                # large batches are split to stay under the bind parameter limit
+                chunk_size = rows_per_statement(Game.__table__)
+                for start in range(0, len(new_rows), chunk_size):
+                    new_games.extend(db.session.scalars(
+                        insert_stmt.values(new_rows[start:start + chunk_size]).on_conflict_do_nothing(
+                            index_elements=['guid']
+                        ).returning(Game)
+                    ))
+            else:
+                new_games = [Game(**row) for row in new_rows]
+                db.session.add_all(new_games)
+                db.session.flush()
+            counts['inserted'] = len(new_games)
+            games_by_guid.update((game.guid, game) for game in new_games)
             
-        # Check if game already exists
-        existing_game = Game.query.filter_by(guid=game_data.get('guid')).first()
-        if existing_game:
-            print(f"Game already cached: {existing_game.name} (GUID: {existing_game.guid})")
-            return existing_game
-        
-        print(f"Caching new game: {game_data.get('name')} (GUID: {game_data.get('guid')})")
-        
-        # Extract image URLs
-        image = game_data.get('image', {}) if game_data.get('image') else {}
-        
-        # Create new game
-        new_game = Game(
-            guid=game_data.get('guid'),
-            name=game_data.get('name'),
-            description=game_data.get('description'),
-            deck=game_data.get('deck'),
-            original_release_date=game_data.get('original_release_date'),
-            expected_release_year=game_data.get('expected_release_year'),
-            expected_release_quarter=game_data.get('expected_release_quarter'),
-            expected_release_month=game_data.get('expected_release_month'),
-            expected_release_day=game_data.get('expected_release_day'),
-            
-            # Image URLs
-            image_url=image.get('medium_url'),
-            thumb_url=image.get('thumb_url'),
-            icon_url=image.get('icon_url'),
-            small_url=image.get('small_url'),
-            super_url=image.get('super_url'),
-            screen_url=image.get('screen_url'),
-            screen_large_url=image.get('screen_large_url'),
-            tiny_url=image.get('tiny_url'),
-            
-            # JSON fields
-            platforms=game_data.get('platforms'),
-            genres=game_data.get('genres'),
-            developers=game_data.get('developers'),
-            publishers=game_data.get('publishers'),
-            franchises=game_data.get('franchises'),
-            concepts=game_data.get('concepts'),
-            themes=game_data.get('themes'),
-            
-            # Text fields
-            aliases=game_data.get('aliases'),
-            
-            # URLs
-            site_detail_url=game_data.get('site_detail_url'),
-            api_detail_url=game_data.get('api_detail_url'),
-            
-            # Metadata
-            number_of_user_reviews=game_data.get('number_of_user_reviews', 0),
-            original_game_rating=game_data.get('original_game_rating'),
-            
-            # Giant Bomb timestamps
-            date_added=game_data.get('date_added'),
-            date_last_updated=game_data.get('date_last_updated')
+            # Pick up games that lost an insert race to another request
+            missing = [guid for guid in payload_by_guid if guid not in games_by_guid]
+            if missing:
+                games_by_guid.update(
+                    (game.guid, game) for game in Game.query.filter(Game.guid.in_(missing)).all()
+                )
+                counts['unchanged'] += len(missing)
+        
+        # Normalized platform/genre/... rows for indexed filtering
+        tag_rows = [row for game in new_games for row in GameTag.rows_for(game.id, payload_by_guid[game.guid])]
+        tag_rows.extend(
+            row for game in updated_games if game.id in retagged_ids for row in GameTag.rows_for_game(game)
         )
+        if tag_rows:
+            db.session.execute(GameTag.__table__.insert(), tag_rows)
         
-        db.session.add(new_game)
-        db.session.commit()
+        # Long-form descriptions go to their own compressed table
+        description_rows.extend(
+            row for row in (
+                GameDescription.row_for(game.id, payload_by_guid[game.guid].get('description')) for game in new_games
+            ) if row is not None
+        )
+        if description_rows:
+            db.session.execute(GameDescription.__table__.insert(), description_rows)
+        
+        # Libraries showing a refreshed game are now stale
+        UserLibraryVersion.bump_owners([game.id for game in updated_games])
+        
+        # Detach before committing so serializing them afterwards doesn't reload every row
+        for game in games_by_guid.values():
+            db.session.expunge(game)
+        pending = (new_games + updated_games if reindex else [], previous_titles, bool(updated_games))
+        if commit:
+            db.session.commit()
+            _index_cached_batch(*pending)
+        else:
+            # In-memory indexes must not show games the caller may still roll back
+            db.session.info.setdefault(PENDING_GAME_INDEX, []).append(pending)
         
-        print(f"Successfully cached new game: {new_game.name} (ID: {new_game.id}, GUID: {new_game.guid})")
-        return new_game
+        logger.debug("Cached games", extra=counts)
+        return games_by_guid, counts
         
     except Exception as e:
         db.session.rollback()
-        print(f"Error caching game {game_data.get('name', 'Unknown')}: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        return None
+        logger.error("Error bulk caching games", extra={'game_count': len(payload_by_guid), 'error': str(e)})
+        raise
 
 class GameSearchSchema(Schema):
     query = fields.Str(required=True, validate=lambda x: len(x.strip()) >= 2)
     limit = fields.Int(missing=10, validate=lambda x: 1 <= x <= 50)
 
+LIBRARY_STATUSES = ('want_to_play', 'playing', 'completed', 'dropped', 'collection')
+
 class AddGameToLibrarySchema(Schema):
     game_guid = fields.Str(required=True)
-    status = fields.Str(missing='want_to_play', validate=lambda x: x in ['want_to_play', 'playing', 'completed', 'dropped', 'collection'])
+    status = fields.Str(missing='want_to_play', validate=lambda x: x in LIBRARY_STATUSES)
     platform_id = fields.Str(allow_none=True)
 
 class UpdateUserGameSchema(Schema):
-    status = fields.Str(validate=lambda x: x in ['want_to_play', 'playing', 'completed', 'dropped', 'collection'])
+    status = fields.Str(validate=lambda x: x in LIBRARY_STATUSES)
     rating = fields.Int(validate=lambda x: x is None or (1 <= x <= 10), allow_none=True)
     hours_played = fields.Float(validate=lambda x: x is None or x >= 0, allow_none=True)
     platform_id = fields.Str(allow_none=True)
@@ -117,16 +451,63 @@ def search_games():
                 'message': 'Query must be at least 2 characters long'
             }), 400
         
-        # Search games by name (case-insensitive)
-        local_games = Game.query.filter(
-            Game.name.ilike(f'%{query}%')
-        ).limit(limit).all()
+        try:
+            game_fields = Game.resolve_fields(request.args.get('view'), request.args.get('fields'))
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'message': str(e)
+            }), 400
+        
+        mode = request.args.get('mode', 'exact')
+        if mode not in ('exact', 'fuzzy'):
+            return jsonify({
+                'success': False,
+                'message': 'mode must be exact or fuzzy'
+            }), 400
+        
+        cursor = request.args.get('cursor') or None
+        cache_key = (query.lower(), limit, game_fields, cursor, mode)
+        page = search_results_cache.get(cache_key)
+        
+        if page is None:
+            def compute_page():
+                # Games cached while this runs invalidate the cache; don't store a stale page then
+                generation = search_results_cache.generation
+                if mode == 'fuzzy':
+                    # Typo-tolerant search (single page, no cursor)
+                    local_games, next_cursor = fuzzy_search_games(query, limit, game_fields), None
+                else:
+                    # Ranked search through the text index (exact and prefix matches first)
+                    local_games, next_cursor = search_index.search_page(query, limit, game_fields, cursor)
+                result = {
+                    'games': [game.to_dict(game_fields) for game in local_games],
+                    'next_cursor': next_cursor,
+                    'suggestion': None
+                }
+                if not local_games and not cursor:
+                    # "Did you mean" for queries with no matches
+                    result['suggestion'] = fuzzy_index.suggest(query)
+                search_results_cache.set(cache_key, result, generation)
+                return result
+            
+            try:
+                page = search_flight.do(cache_key, compute_page)
+            except ValueError as e:
+                return jsonify({
+                    'success': False,
+                    'message': str(e)
+                }), 400
         
         return jsonify({
             'success': True,
-            'games': [game.to_dict() for game in local_games],
-            'count': len(local_games),
-            'source': 'local_database'
+            'games': page['games'],
+            'count': len(page['games']),
+            'next_cursor': page['next_cursor'],
+            'suggestion': page['suggestion'],
+            'mode': mode,
+            'source': 'local_database',
+            'search_backend': search_index.backend
         }), 200
         
     except Exception as e:
@@ -136,11 +517,134 @@ def search_games():
             'error': str(e)
         }), 500
 
+@games_bp.route('/autocomplete', methods=['GET'])
+def autocomplete_games():
+    """Suggest games by name/alias prefix from the in-memory index"""
+    try:
+        query = request.args.get('q', '').strip()
+        limit = min(int(request.args.get('limit', 8)), autocomplete_index.max_results)
+        
+        if not query:
+            return jsonify({
+                'success': True,
+                'suggestions': [],
+                'count': 0
+            }), 200
+        
+        suggestions = autocomplete_index.suggest(query, limit)
+        
+        return jsonify({
+            'success': True,
+            'suggestions': suggestions,
+            'count': len(suggestions)
+        }), 200
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': 'Autocomplete failed',
+            'error': str(e)
+        }), 500
+
+def _browse_conditions(filters, exclude=None):
+    """SQL conditions for the browse filters, optionally leaving one facet out"""
+    conditions = []
+    for kind in ('platform', 'genre'):
+        if filters.get(kind) and exclude != kind:
+            conditions.append(Game.id.in_(
+                select(GameTag.game_id).where(GameTag.kind == kind, GameTag.ref == filters[kind])
+            ))
+    if filters.get('year') and exclude != 'year':
+        conditions.append(Game.release_year == filters['year'])
+    return conditions
+
+def _tag_facet(kind, filters, size=50):
+    """Counts per tag of the given kind among games matching the other filters"""
+    conditions = _browse_conditions(filters, exclude=kind)
+    count = func.count(GameTag.game_id).label('count')
+    query = db.session.query(GameTag.ref, func.max(GameTag.name), count).filter(GameTag.kind == kind)
+    if conditions:
+        query = query.filter(GameTag.game_id.in_(select(Game.id).where(*conditions)))
+    rows = query.group_by(GameTag.ref).order_by(count.desc(), GameTag.ref).limit(size).all()
+    return [{'ref': ref, 'name': name, 'count': total} for ref, name, total in rows]
+
+def _year_facet(filters):
+    """Counts per release year among games matching the other filters"""
+    count = func.count(Game.id).label('count')
+    rows = db.session.query(Game.release_year, count).filter(
+        Game.release_year.isnot(None), *_browse_conditions(filters, exclude='year')
+    ).group_by(Game.release_year).order_by(Game.release_year.desc()).all()
+    return [{'year': year, 'count': total} for year, total in rows]
+
+@games_bp.route('/browse', methods=['GET'])
+def browse_games():
+    """Browse cached games by platform, genre and release year with facet counts"""
+    try:
+        limit = min(int(request.args.get('limit', 20)), 50)
+        filters = {
+            'platform': request.args.get('platform') or None,
+            'genre': request.args.get('genre') or None,
+            'year': int(request.args['year']) if request.args.get('year') else None
+        }
+        
+        try:
+            game_fields = Game.resolve_fields(request.args.get('view', 'card'), request.args.get('fields'))
+            cursor = request.args.get('cursor')
+            after = decode_cursor(cursor, (str, int)) if cursor else None
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'message': str(e)
+            }), 400
+        
+        conditions = _browse_conditions(filters)
+        games_query = Game.query.options(*Game.load_options(game_fields)).filter(*conditions)
+        if after is not None:
+            games_query = games_query.filter(or_(
+                Game.name > after[0],
+                and_(Game.name == after[0], Game.id > after[1])
+            ))
+        games = games_query.order_by(Game.name, Game.id).limit(limit + 1).all()
+        
+        next_cursor = None
+        if len(games) > limit:
+            games = games[:limit]
+            next_cursor = encode_cursor(games[-1].name, games[-1].id)
+        
+        total = db.session.query(func.count(Game.id)).filter(*conditions).scalar()
+        
+        return jsonify({
+            'success': True,
+            'games': [game.to_dict(game_fields) for game in games],
+            'count': len(games),
+            'total': total,
+            'next_cursor': next_cursor,
+            'filters': filters,
+            'facets': {
+                'platforms': _tag_facet('platform', filters),
+                'genres': _tag_facet('genre', filters),
+                'years': _year_facet(filters)
+            }
+        }), 200
+        
+    except ValueError:
+        return jsonify({
+            'success': False,
+            'message': 'Invalid limit or year'
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': 'Browse failed',
+            'error': str(e)
+        }), 500
+
 @games_bp.route('/<game_guid>', methods=['GET'])
 def get_game_by_guid(game_guid):
     """Get game details by GUID"""
     try:
-        game = Game.query.filter_by(guid=game_guid).first()
+        # The detail view is the only one that loads the long-form description
+        game = Game.query.options(joinedload(Game.description_record)).filter_by(guid=game_guid).first()
         
         if not game:
             return jsonify({
@@ -148,6 +652,9 @@ def get_game_by_guid(game_guid):
                 'message': 'Game not found'
             }), 404
         
+        # Games not yet reached by move-game-descriptions still have it in games.description
+        game.load_legacy_description()
+        
         return jsonify({
             'success': True,
             'game': game.to_dict()
@@ -160,29 +667,367 @@ def get_game_by_guid(game_guid):
             'error': str(e)
         }), 500
 
+# Library sort keys -> (column, default direction); NULLs always sort last
+# sort -> (column, default order, types a cursor value may have)
+LIBRARY_SORTS = {
+    'date_added': (UserGame.date_added, 'desc', (str, type(None))),
+    'rating': (UserGame.rating, 'desc', (int, type(None))),
+    'hours_played': (UserGame.hours_played, 'desc', (int, float, type(None))),
+    'name': (Game.name, 'asc', (str,))
+}
+
+# Rows fetched per round trip when streaming a library
+LIBRARY_STREAM_BATCH = 500
+
+def _library_filters(args):
+    """Parse the library filter parameters; raises ValueError on unknown values"""
+    filters = {
+        'status': args.get('status') or None,
+        'platform_id': args.get('platform_id') or None,
+        'rated': None
+    }
+    if filters['status'] and filters['status'] not in LIBRARY_STATUSES:
+        raise ValueError(f"status must be one of {', '.join(LIBRARY_STATUSES)}")
+    rated = (args.get('rated') or '').lower()
+    if rated:
+        if rated not in ('true', 'false'):
+            raise ValueError('rated must be true or false')
+        filters['rated'] = rated == 'true'
+    return filters
+
+def _library_conditions(user_id, filters):
+    """SQL conditions selecting a user's library rows that match the filters"""
+    conditions = [UserGame.user_id == user_id]
+    if filters['status']:
+        conditions.append(UserGame.status == filters['status'])
+    if filters['platform_id']:
+        conditions.append(UserGame.platform_id == filters['platform_id'])
+    if filters['rated'] is not None:
+        conditions.append(UserGame.rating.isnot(None) if filters['rated'] else UserGame.rating.is_(None))
+    return conditions
+
+def _decode_library_cursor(cursor, column, value_types):
+    """(value, id) position of a library cursor for the sort column; raises ValueError if invalid"""
+    value, after_id = decode_cursor(cursor, (value_types, int))
+    if column is UserGame.date_added and value is not None:
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            raise ValueError('Invalid cursor')
+    return value, after_id
+
+def _library_after(column, descending, after):
+    """Keyset condition for rows following a decoded (value, id) cursor position"""
+    value, after_id = after
+    past_id = UserGame.id < after_id if descending else UserGame.id > after_id
+    if value is None:
+        # Already in the trailing NULL block
+        return and_(column.is_(None), past_id)
+    past_value = column < value if descending else column > value
+    return or_(past_value, and_(column == value, past_id), column.is_(None))
+
+def _library_cursor(column, user_game):
+    value = user_game.game.name if column is Game.name else getattr(user_game, column.key)
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    return encode_cursor(value, user_game.id)
+
+def _stream_library(library_query, game_fields, sync_token, column, limit):
+    """
+    Yield the library response as JSON text, one row at a time. With a limit
+    the query must fetch one extra row, which only decides next_cursor.
+    """
+    yield '{"success": true, "library": ['
+    count = 0
+    next_cursor = None
+    for user_game in library_query.yield_per(LIBRARY_STREAM_BATCH):
+        if limit and count == limit:
+            next_cursor = _library_cursor(column, last_user_game)
+            break
+        yield (',' if count else '') + json.dumps(user_game.to_dict(game_fields))
+        count += 1
+        last_user_game = user_game
+    yield f'], "count": {count}, "next_cursor": {json.dumps(next_cursor)}, "sync_token": {sync_token}}}'
+
 @games_bp.route('/library', methods=['GET'])
 @jwt_required()
 def get_user_library():
-    """Get current user's game library"""
+    """
+    Get current user's game library, optionally filtered (status, platform_id,
+    rated), sorted (sort=date_added|rating|hours_played|name, order=asc|desc)
+    and paginated (limit, cursor). stream=true writes the rows out as they are
+    read instead of building the whole response in memory.
+    """
     try:
         user_id = int(get_jwt_identity())
         
+        try:
+            game_fields = Game.resolve_fields(request.args.get('view'), request.args.get('fields'))
+            filters = _library_filters(request.args)
+            sort = request.args.get('sort', 'date_added')
+            if sort not in LIBRARY_SORTS:
+                raise ValueError(f"sort must be one of {', '.join(LIBRARY_SORTS)}")
+            column, order, value_types = LIBRARY_SORTS[sort]
+            order = request.args.get('order', order)
+            if order not in ('asc', 'desc'):
+                raise ValueError('order must be asc or desc')
+            limit = int(request.args['limit']) if request.args.get('limit') else None
+            if limit is not None and not 1 <= limit <= 200:
+                raise ValueError('limit must be between 1 and 200')
+            cursor = request.args.get('cursor')
+            after = _decode_library_cursor(cursor, column, value_types) if cursor else None
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'message': str(e)
+            }), 400
+        
+        # Unchanged since the client's copy: answer 304 without querying the library
+        version = UserLibraryVersion.versions([user_id])[user_id]
+        etag = version_etag(user_id, version)
+        cached = not_modified(etag)
+        if cached is not None:
+            return cached
+        
+        descending = order == 'desc'
+        library_query = UserGame.query.join(UserGame.game).options(
+            UserGame.game_loader(game_fields, joined=True)
+        ).filter(*_library_conditions(user_id, filters))
+        if after is not None:
+            library_query = library_query.filter(_library_after(column, descending, after))
+        library_query = library_query.order_by(
+            (column.desc() if descending else column.asc()).nulls_last(),
+            UserGame.id.desc() if descending else UserGame.id.asc()
+        )
+        
+        # One extra row tells whether there is a next page
+        library_query = library_query.limit(limit + 1 if limit else None)
+        
+        if request.args.get('stream', '').lower() == 'true':
+            return with_etag(
+                Response(
+                    stream_with_context(_stream_library(library_query, game_fields, version, column, limit)),
+                    mimetype='application/json'
+                ),
+                etag
+            )
+        
         # Get user's games with game details
-        user_games = UserGame.query.filter_by(user_id=user_id).all()
+        user_games = library_query.all()
+        next_cursor = None
+        if limit and len(user_games) > limit:
+            user_games = user_games[:limit]
+            next_cursor = _library_cursor(column, user_games[-1])
+        
+        return with_etag(jsonify({
+            'success': True,
+            'library': [user_game.to_dict(game_fields) for user_game in user_games],
+            'count': len(user_games),
+            'next_cursor': next_cursor,
+            'filters': filters,
+            'sort': sort,
+            'order': order,
+            'sync_token': version
+        }), etag), 200
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': 'Failed to get library',
+            'error': str(e)
+        }), 500
+
+@games_bp.route('/library/changes', methods=['GET'])
+@jwt_required()
+def get_library_changes():
+    """
+    Library rows added or changed since a sync token, plus removed entries.
+    since=0 returns the whole library; pass the returned sync_token next time.
+    Clients should apply removals and changes in change_seq order. A 410 means
+    the token can no longer be served (tombstones pruned); sync from since=0.
+    """
+    try:
+        user_id = int(get_jwt_identity())
+        
+        try:
+            game_fields = Game.resolve_fields(request.args.get('view'), request.args.get('fields'))
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'message': str(e)
+            }), 400
+        
+        since = request.args.get('since', '')
+        if not since.isdigit():
+            return jsonify({
+                'success': False,
+                'message': 'since must be a sync token (0 for a full sync)'
+            }), 400
+        since = int(since)
+        
+        version = UserLibraryVersion.versions([user_id])[user_id]
+        if since > version:
+            return jsonify({
+                'success': False,
+                'message': 'Unknown sync token; sync again from since=0'
+            }), 410
+        
+        # Changes and removals are capped at the version read above, which is the
+        # returned token; anything committed later is picked up by the next sync
+        changed, removed = [], []
+        if since < version or since == 0:
+            changes_query = UserGame.query.options(UserGame.game_loader(game_fields)).filter(UserGame.user_id == user_id)
+            if since:
+                # Rows last changed before change tracking existed have no change_seq and count as old
+                changes_query = changes_query.filter(UserGame.change_seq > since, UserGame.change_seq <= version)
+                removed = UserGameTombstone.query.filter(
+                    UserGameTombstone.user_id == user_id,
+                    UserGameTombstone.change_seq > since,
+                    UserGameTombstone.change_seq <= version
+                ).order_by(UserGameTombstone.change_seq).all()
+                # Checked after reading tombstones, so a concurrent prune can't slip in between
+                if since < UserLibraryVersion.pruned_through(user_id):
+                    return jsonify({
+                        'success': False,
+                        'message': 'Sync token too old; sync again from since=0'
+                    }), 410
+            else:
+                changes_query = changes_query.filter(or_(UserGame.change_seq.is_(None), UserGame.change_seq <= version))
+            changed = changes_query.order_by(UserGame.change_seq, UserGame.id).all()
+        
+        sync_token = version
         
         return jsonify({
             'success': True,
-            'library': [user_game.to_dict() for user_game in user_games],
-            'count': len(user_games)
+            'changes': [user_game.to_dict(game_fields) for user_game in changed],
+            'removed': [tombstone.to_dict() for tombstone in removed],
+            'count': len(changed) + len(removed),
+            'since': since,
+            'sync_token': sync_token
         }), 200
         
     except Exception as e:
         return jsonify({
             'success': False,
-            'message': 'Failed to get library',
+            'message': 'Failed to get library changes',
             'error': str(e)
         }), 500
 
+# Columns of a library export, in order
+EXPORT_COLUMNS = (
+    'id', 'game_guid', 'game_name', 'platform_id', 'platform_name', 'status', 'rating',
+    'hours_played', 'review', 'date_added', 'date_started', 'date_completed'
+)
+
+# Rows fetched per round trip (and written per chunk) when exporting
+EXPORT_BATCH = int(os.getenv('LIBRARY_EXPORT_BATCH', 1000))
+
+def _export_rows(user_id):
+    """Yield batches of export rows (tuples in EXPORT_COLUMNS order) from a server-side cursor"""
+    query = select(
+        UserGame.id, Game.guid, Game.name, UserGame.platform_id, Platform.name, UserGame.status,
+        UserGame.rating, UserGame.hours_played, UserGame.review,
+        UserGame.date_added, UserGame.date_started, UserGame.date_completed
+    ).join(Game, UserGame.game_id == Game.id).outerjoin(
+        Platform, Platform.guid == UserGame.platform_id
+    ).where(UserGame.user_id == user_id).order_by(UserGame.id)
+    result = db.session.execute(query.execution_options(yield_per=EXPORT_BATCH))
+    for batch in result.partitions():
+        yield [
+            tuple(value.isoformat() if isinstance(value, datetime) else value for value in row)
+            for row in batch
+        ]
+
+def _export_csv(user_id):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for batch in _export_rows(user_id):
+        writer.writerows(batch)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+def _export_ndjson(user_id):
+    for batch in _export_rows(user_id):
+        yield ''.join(json.dumps(dict(zip(EXPORT_COLUMNS, row))) + '\n' for row in batch)
+
+# format -> (row writer, mimetype)
+EXPORT_FORMATS = {
+    'csv': (_export_csv, 'text/csv'),
+    'ndjson': (_export_ndjson, 'application/x-ndjson')
+}
+
+@games_bp.route('/library/export', methods=['GET'])
+@jwt_required()
+def export_library():
+    """Download the user's library as CSV or NDJSON, streamed in chunks"""
+    try:
+        user_id = int(get_jwt_identity())
+        
+        export_format = request.args.get('format', 'csv')
+        if export_format not in EXPORT_FORMATS:
+            return jsonify({
+                'success': False,
+                'message': 'format must be csv or ndjson'
+            }), 400
+        
+        write_rows, mimetype = EXPORT_FORMATS[export_format]
+        response = Response(stream_with_context(write_rows(user_id)), mimetype=mimetype)
+        response.headers['Content-Disposition'] = f'attachment; filename=library.{export_format}'
+        return response
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': 'Failed to export library',
+            'error': str(e)
+        }), 500
+
+def insert_library_entry(values):
+    """
+    Add a library row unless the user already has the game, with a single
+    INSERT ... ON CONFLICT (user_id, game_id) DO NOTHING RETURNING statement.
+    Returns the new UserGame, or None if the game was already in the library.
+    """
+    insert_stmt = upsert_insert(UserGame)
+    if insert_stmt is not None:
+        return db.session.scalars(
+            insert_stmt.values(values).on_conflict_do_nothing(index_elements=['user_id', 'game_id']).returning(UserGame)
+        ).first()
+    if UserGame.query.filter_by(user_id=values['user_id'], game_id=values['game_id']).first():
+        return None
+    user_game = UserGame(**values)
+    db.session.add(user_game)
+    db.session.flush()
+    return user_game
+
+def add_library_entry(user_id, game, status, platform_id):
+    """
+    Add the game to the user's library with its version and stats updates, and
+    commit. Returns the serialized entry, or None (nothing written) if the game
+    was already in the library.
+    """
+    user_game = insert_library_entry({
+        'user_id': user_id,
+        'game_id': game.id,
+        'status': status,
+        'platform_id': platform_id,
+        'change_seq': UserLibraryVersion.bump([user_id])[user_id]
+    })
+    if user_game is None:
+        # Also undoes the version bump
+        db.session.rollback()
+        return None
+    UserLibraryStats.apply(user_id, UserLibraryStats.delta(added=[UserLibraryStats.snapshot(user_game)]))
+    
+    # Serialize from the game already in hand rather than reloading both rows after the commit
+    set_committed_value(user_game, 'game', game)
+    user_game_data = user_game.to_dict()
+    db.session.commit()
+    return user_game_data
+
 @games_bp.route('/library/add', methods=['POST'])
 @jwt_required()
 def add_game_to_library():
@@ -194,46 +1039,28 @@ def add_game_to_library():
         schema = AddGameToLibrarySchema()
         data = schema.load(request.get_json())
         
-        print(f"add_game_to_library called by user {user_id} for game GUID: {data['game_guid']}")
-        
         # Check if game exists
         game = Game.query.filter_by(guid=data['game_guid']).first()
         if not game:
-            print(f"Game with GUID {data['game_guid']} not found in database")
             return jsonify({
                 'success': False,
                 'message': 'Game not found in database. Please search for the game first.'
             }), 404
         
-        print(f"Found game in database: {game.name} (ID: {game.id})")
-        
-        # Check if game is already in user's library
-        existing = UserGame.query.filter_by(user_id=user_id, game_id=game.id).first()
-        if existing:
-            print(f"Game already in user's library: {existing.id}")
+        # Add game to library (the unique constraint rejects duplicates atomically)
+        user_game_data = add_library_entry(user_id, game, data['status'], data.get('platform_id'))
+        if user_game_data is None:
             return jsonify({
                 'success': False,
                 'message': 'Game already in library'
             }), 400
         
-        # Add game to library
-        user_game = UserGame(
-            user_id=user_id,
-            game_id=game.id,
-            status=data['status'],
-            platform_id=data.get('platform_id'),
-            image_url=game.image_url  # Store the image URL for quick access
-        )
-        
-        db.session.add(user_game)
-        db.session.commit()
-        
-        print(f"Successfully added game to user's library: UserGame ID {user_game.id}")
+        logger.debug("Game added to library", extra={'game_guid': data['game_guid'], 'user_game_id': user_game_data['id']})
         
         return jsonify({
             'success': True,
             'message': 'Game added to library',
-            'user_game': user_game.to_dict()
+            'user_game': user_game_data
         }), 201
         
     except ValidationError as e:
@@ -258,8 +1085,6 @@ def add_external_game_to_library():
         user_id = int(get_jwt_identity())
         data = request.get_json()
         
-        print("add-external called with data:", data)
-        
         # Required fields from external API
         required_fields = ['guid', 'name']
         for field in required_fields:
@@ -269,46 +1094,26 @@ def add_external_game_to_library():
                     'message': f'Missing required field: {field}'
                 }), 400
         
-        # First check if game already exists in our database
-        existing_game = Game.query.filter_by(guid=data['guid']).first()
-        
-        if existing_game:
-            print(f"Game {data['name']} already exists in database, using existing entry")
-            game = existing_game
-        else:
-            # Use the cache function to create new game entry
-            print(f"Caching new game: {data['name']}")
-            game = cache_game_from_api_data(data)
-            if not game:
-                return jsonify({
-                    'success': False,
-                    'message': 'Failed to cache game data'
-                }), 500
+        # Cache the game (or refresh the cached copy if this payload is newer)
+        game = cache_game_from_api_data(data)
+        if not game:
+            return jsonify({
+                'success': False,
+                'message': 'Failed to cache game data'
+            }), 500
         
-        # Check if game is already in user's library
-        existing = UserGame.query.filter_by(user_id=user_id, game_id=game.id).first()
-        if existing:
+        # Add game to user's library (the unique constraint rejects duplicates atomically)
+        user_game_data = add_library_entry(user_id, game, data.get('status', 'want_to_play'), data.get('platform_id'))
+        if user_game_data is None:
             return jsonify({
                 'success': False,
                 'message': 'Game already in library'
             }), 400
         
-        # Add game to user's library
-        user_game = UserGame(
-            user_id=user_id,
-            game_id=game.id,
-            status=data.get('status', 'want_to_play'),
-            platform_id=data.get('platform_id'),
-            image_url=game.image_url  # Store the image URL for quick access
-        )
-        
-        db.session.add(user_game)
-        db.session.commit()
-        
         return jsonify({
             'success': True,
             'message': 'Game added to library',
-            'user_game': user_game.to_dict()
+            'user_game': user_game_data
         }), 201
         
     except IntegrityError as e:
@@ -327,7 +1132,7 @@ def add_external_game_to_library():
         }), 422
     except Exception as e:
         db.session.rollback()
-        print(f"Error adding external game: {str(e)}")
+        logger.exception("Error adding external game to library")
         return jsonify({
             'success': False,
             'message': 'Failed to add game to library',
@@ -349,7 +1154,15 @@ def remove_game_from_library(user_game_id):
                 'message': 'Game not found in library'
             }), 404
         
+        # Leave a tombstone so delta sync clients learn about the removal
+        db.session.add(UserGameTombstone(
+            user_id=user_id,
+            user_game_id=user_game.id,
+            game_id=user_game.game_id,
+            change_seq=UserLibraryVersion.bump([user_id])[user_id]
+        ))
         db.session.delete(user_game)
+        UserLibraryStats.apply(user_id, UserLibraryStats.delta(removed=[UserLibraryStats.snapshot(user_game)]))
         db.session.commit()
         
         return jsonify({
@@ -384,6 +1197,9 @@ def update_user_game(user_game_id):
                 'message': 'Game not found in library'
             }), 404
         
+        user_game.change_seq = UserLibraryVersion.bump([user_id])[user_id]
+        before = UserLibraryStats.snapshot(user_game)
+        
         # Update allowed fields
         if 'status' in data:
             user_game.status = data['status']
@@ -405,6 +1221,7 @@ def update_user_game(user_game_id):
             elif data['status'] == 'completed' and not user_game.date_completed:
                 user_game.date_completed = datetime.utcnow()
         
+        UserLibraryStats.apply(user_id, UserLibraryStats.delta(removed=[before], added=[UserLibraryStats.snapshot(user_game)]))
         db.session.commit()
         
         return jsonify({
@@ -427,15 +1244,256 @@ def update_user_game(user_game_id):
             'error': str(e)
         }), 500
 
+# Most operations accepted by one /library/batch request
+MAX_BATCH_OPERATIONS = int(os.getenv('LIBRARY_BATCH_MAX', 500))
+
+class BatchEntrySchema(Schema):
+    id = fields.Int(required=True)
+
+def _parse_batch_operation(item):
+    """Validate one /library/batch operation; returns (op, data) or raises ValidationError"""
+    if not isinstance(item, dict):
+        raise ValidationError('Operation must be an object')
+    op = item.get('op')
+    fields_data = {key: value for key, value in item.items() if key not in ('op', 'game', 'id')}
+    if op == 'add':
+        game_data = item.get('game')
+        if game_data is not None:
+            # Giant Bomb payload, cached before the batch is applied (as /library/add-external does)
+            if not isinstance(game_data, dict) or not game_data.get('guid') or not game_data.get('name'):
+                raise ValidationError({'game': ['Game data needs a guid and a name']})
+            fields_data['game_guid'] = game_data['guid']
+        return op, AddGameToLibrarySchema().load(fields_data)
+    if op == 'update':
+        data = UpdateUserGameSchema().load(fields_data)
+        data.update(BatchEntrySchema().load({'id': item.get('id')}))
+        return op, data
+    if op == 'remove':
+        return op, BatchEntrySchema().load({'id': item.get('id')})
+    raise ValidationError({'op': ['op must be add, update or remove']})
+
+@games_bp.route('/library/batch', methods=['POST'])
+@jwt_required()
+def batch_update_library():
+    """
+    Apply many add / update / remove operations to the user's library in one
+    transaction. Each operation gets its own result; invalid operations are
+    skipped unless "atomic" is true, in which case nothing is applied.
+    """
+    try:
+        user_id = int(get_jwt_identity())
+        payload = request.get_json() or {}
+        operations = payload.get('operations')
+        atomic = bool(payload.get('atomic', False))
+        
+        if not isinstance(operations, list) or not operations:
+            return jsonify({
+                'success': False,
+                'message': 'operations must be a non-empty list'
+            }), 400
+        if len(operations) > MAX_BATCH_OPERATIONS:
+            return jsonify({
+                'success': False,
+                'message': f'At most {MAX_BATCH_OPERATIONS} operations per batch'
+            }), 413
+        
+        results = [None] * len(operations)
+        parsed = []
+        for index, item in enumerate(operations):
+            try:
+                op, data = _parse_batch_operation(item)
+                parsed.append((index, op, data))
+            except ValidationError as e:
+                op = item.get('op') if isinstance(item, dict) else None
+                results[index] = {'index': index, 'op': op, 'success': False, 'message': 'Validation error', 'errors': e.messages}
+        
+        # Cache any external game payloads up front, in one bulk call within this transaction
+        external_games = [
+            operations[index]['game'] for index, op, _ in parsed if op == 'add' and 'game' in operations[index]
+        ]
+        if external_games:
+            cache_games_bulk(external_games, commit=False)
+        
+        # One lookup for every referenced game and one for the affected library rows
+        guids = {data['game_guid'] for _, op, data in parsed if op == 'add'}
+        game_ids = dict(
+            db.session.execute(select(Game.guid, Game.id).where(Game.guid.in_(guids))).all()
+        ) if guids else {}
+        entry_ids = {data['id'] for _, op, data in parsed if op != 'add'}
+        conditions = []
+        if game_ids:
+            conditions.append(UserGame.game_id.in_(list(game_ids.values())))
+        if entry_ids:
+            conditions.append(UserGame.id.in_(entry_ids))
+        rows = db.session.execute(
+            select(
+                UserGame.id, UserGame.game_id, UserGame.status, UserGame.rating, UserGame.hours_played,
+                UserGame.date_started, UserGame.date_completed
+            ).where(
+                UserGame.user_id == user_id, or_(*conditions)
+            )
+        ).all() if conditions else []
+        owned_game_ids = {row.game_id for row in rows}
+        rows_by_id = {row.id: row for row in rows}
+        
+        def fail(index, op, message):
+            results[index] = {'index': index, 'op': op, 'success': False, 'message': message}
+        
+        def reject_atomic():
+            db.session.rollback()
+            discard_pending_games()
+            failures = [result for result in results if result is not None and not result['success']]
+            return jsonify({
+                'success': False,
+                'message': 'No changes applied: some operations are invalid',
+                'results': failures,
+                'applied': 0,
+                'failed': len(failures)
+            }), 422
+        
+        new_rows, new_indexes, updates, update_indexes, removed_ids, remove_indexes = [], [], [], [], [], []
+        touched_ids = set()
+        now = datetime.utcnow()
+        for index, op, data in parsed:
+            if op == 'add':
+                game_id = game_ids.get(data['game_guid'])
+                if game_id is None:
+                    fail(index, op, 'Game not found in database. Please search for the game first.')
+                elif game_id in owned_game_ids:
+                    fail(index, op, 'Game already in library')
+                else:
+                    owned_game_ids.add(game_id)
+                    new_rows.append({
+                        'user_id': user_id,
+                        'game_id': game_id,
+                        'status': data['status'],
+                        'platform_id': data.get('platform_id')
+                    })
+                    new_indexes.append(index)
+                continue
+            
+            row = rows_by_id.get(data['id'])
+            if row is None:
+                fail(index, op, 'Game not found in library')
+            elif row.id in touched_ids:
+                fail(index, op, 'Library entry already changed by an earlier operation in this batch')
+            elif op == 'remove':
+                touched_ids.add(row.id)
+                removed_ids.append(row.id)
+                remove_indexes.append(index)
+            else:
+                touched_ids.add(row.id)
+                changes = {key: value for key, value in data.items() if key != 'id'}
+                if changes.get('status') == 'playing' and not row.date_started:
+                    changes['date_started'] = now
+                elif changes.get('status') == 'completed' and not row.date_completed:
+                    changes['date_completed'] = now
+                updates.append(dict(changes, id=row.id))
+                update_indexes.append(index)
+        
+        if atomic and any(result is not None for result in results):
+            return reject_atomic()
+        
+        # Apply everything with bulk statements and a single commit
+        stats_removed, stats_added = [], []
+        if new_rows or updates or removed_ids:
+            change_seq = UserLibraryVersion.bump([user_id])[user_id]
+            for row in new_rows + updates:
+                row['change_seq'] = change_seq
+        if new_rows:
+            insert_stmt = upsert_insert(UserGame)
+            if insert_stmt is not None:
+                inserted = {}
+                chunk_size = rows_per_statement(UserGame.__table__)
+                for start in range(0, len(new_rows), chunk_size):
+                    inserted.update(db.session.execute(
+                        insert_stmt.values(new_rows[start:start + chunk_size]).on_conflict_do_nothing(
+                            index_elements=['user_id', 'game_id']
+                        ).returning(UserGame.game_id, UserGame.id)
+                    ).all())
+            else:
+                entries = [UserGame(**row) for row in new_rows]
+                db.session.add_all(entries)
+                db.session.flush()
+                inserted = {entry.game_id: entry.id for entry in entries}
+            for index, row in zip(new_indexes, new_rows):
+                if row['game_id'] in inserted:
+                    results[index] = {'index': index, 'op': 'add', 'success': True, 'user_game_id': inserted[row['game_id']]}
+                    stats_added.append((row['status'], None, None))
+                else:
+                    # Added by a concurrent request after the lookup above
+                    fail(index, 'add', 'Game already in library')
+        if updates:
+            db.session.execute(update(UserGame), updates)
+            for index, changes in zip(update_indexes, updates):
+                results[index] = {'index': index, 'op': 'update', 'success': True, 'user_game_id': changes['id']}
+                row = rows_by_id[changes['id']]
+                stats_removed.append((row.status, row.rating, row.hours_played))
+                stats_added.append(tuple(
+                    changes.get(column, getattr(row, column)) for column in ('status', 'rating', 'hours_played')
+                ))
+        if removed_ids:
+            db.session.execute(
+                delete(UserGame).where(UserGame.user_id == user_id, UserGame.id.in_(removed_ids))
+            )
+            db.session.execute(UserGameTombstone.__table__.insert(), [
+                {'user_id': user_id, 'user_game_id': entry_id, 'game_id': rows_by_id[entry_id].game_id,
+                 'change_seq': change_seq, 'deleted_at': now}
+                for entry_id in removed_ids
+            ])
+            for index, entry_id in zip(remove_indexes, removed_ids):
+                results[index] = {'index': index, 'op': 'remove', 'success': True, 'user_game_id': entry_id}
+                row = rows_by_id[entry_id]
+                stats_removed.append((row.status, row.rating, row.hours_played))
+        
+        if atomic and not all(result['success'] for result in results):
+            # An add lost a race with a concurrent insert after validation
+            return reject_atomic()
+        
+        UserLibraryStats.apply(user_id, UserLibraryStats.delta(removed=stats_removed, added=stats_added))
+        
+        applied = sum(1 for result in results if result['success'])
+        db.session.commit()
+        index_pending_games()
+        
+        logger.info("Library batch applied", extra={'applied': applied, 'failed': len(results) - applied})
+        
+        return jsonify({
+            'success': True,
+            'results': results,
+            'applied': applied,
+            'failed': len(results) - applied
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        discard_pending_games()
+        logger.exception("Library batch failed")
+        return jsonify({
+            'success': False,
+            'message': 'Failed to apply library batch',
+            'error': str(e)
+        }), 500
+
+def ingest_search_results(search_results):
+    """Cache search results in a background job; returns the job's result summary"""
+    games_by_guid, counts = cache_games_bulk(search_results)
+    digest = payload_digest(search_results)
+    if digest:
+        recent_cache_payloads.set(digest, {guid: game.to_dict() for guid, game in games_by_guid.items()})
+    return dict(counts, cached_count=len(games_by_guid), total_processed=len(search_results))
+
 @games_bp.route('/cache-search-results', methods=['POST'])
 def cache_search_results():
     """
     Cache games from Giant Bomb API search results
     Expects: { "results": [array of game objects from Giant Bomb] }
     Returns: { "cached_count": number, "games": [array of cached games] }
+    With ?async=true the results are validated and queued instead:
+    202 { "job_id": id, "status_url": url }, or 503 with Retry-After when the queue is full
     """
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True) or {}
         search_results = data.get('results', [])
         
         if not search_results:
@@ -444,22 +1502,81 @@ def cache_search_results():
                 'message': 'No search results provided'
             }), 400
         
+        # An identical payload was processed recently: answer without touching the database
+        digest = payload_digest(search_results) if isinstance(search_results, list) else None
+        cached_by_guid = recent_cache_payloads.get(digest) if digest else None
+        if cached_by_guid is not None:
+            cached_games = [
+                cached_by_guid[game_data['guid']] for game_data in search_results
+                if isinstance(game_data, dict) and game_data.get('guid') in cached_by_guid
+            ]
+            return jsonify({
+                'success': True,
+                'cached_count': len(cached_games),
+                'total_processed': len(search_results),
+                'inserted': 0,
+                'updated': 0,
+                'unchanged': len(cached_by_guid),
+                'skipped': 0,
+                'duplicate': True,
+                'games': cached_games
+            }), 200
+        
+        if request.args.get('async', '').lower() in ('1', 'true'):
+            if not isinstance(search_results, list) or len(search_results) > MAX_ASYNC_RESULTS:
+                return jsonify({
+                    'success': False,
+                    'message': f'results must be a list of at most {MAX_ASYNC_RESULTS} games'
+                }), 400
+            if not all(isinstance(game_data, dict) and game_data.get('guid') for game_data in search_results):
+                return jsonify({
+                    'success': False,
+                    'message': 'Every result must be a game object with a guid'
+                }), 400
+            
+            try:
+                job_id = ingest_queue.submit(ingest_search_results, search_results)
+            except QueueFull:
+                response = jsonify({
+                    'success': False,
+                    'message': 'Caching queue is full, try again later'
+                })
+                response.headers['Retry-After'] = str(ingest_queue.retry_after_seconds())
+                return response, 503
+            
+            status_url = f'{request.path}/jobs/{job_id}'
+            response = jsonify({
+                'success': True,
+                'job_id': job_id,
+                'status': 'queued',
+                'status_url': status_url
+            })
+            response.headers['Location'] = status_url
+            return response, 202
+        
+        games_by_guid, counts = cache_games_bulk(search_results)
+        serialized_by_guid = {guid: game.to_dict() for guid, game in games_by_guid.items()}
+        if digest:
+            recent_cache_payloads.set(digest, serialized_by_guid)
+        
         cached_games = []
         cached_count = 0
         
         for game_data in search_results:
-            if not game_data.get('guid'):
-                continue  # Skip games without GUID
-                
-            cached_game = cache_game_from_api_data(game_data)
+            cached_game = serialized_by_guid.get(game_data.get('guid'))
             if cached_game:
-                cached_games.append(cached_game.to_dict())
+                cached_games.append(cached_game)
                 cached_count += 1
         
         return jsonify({
             'success': True,
             'cached_count': cached_count,
             'total_processed': len(search_results),
+            'inserted': counts['inserted'],
+            'updated': counts['updated'],
+            'unchanged': counts['unchanged'],
+            'skipped': counts['skipped'],
+            'duplicate': False,
             'games': cached_games
         }), 200
         
@@ -469,3 +1586,18 @@ def cache_search_results():
             'message': 'Failed to cache search results',
             'error': str(e)
         }), 500
+
+@games_bp.route('/cache-search-results/jobs/<job_id>', methods=['GET'])
+def get_cache_job(job_id):
+    """Status of an asynchronous cache-search-results job"""
+    job = ingest_queue.job(job_id)
+    if not job:
+        return jsonify({
+            'success': False,
+            'message': 'Job not found or expired'
+        }), 404
+    
+    return jsonify({
+        'success': True,
+        'job': job
+    }), 200
@@ -5,9 +5,12 @@ import os
 from datetime import datetime, timedelta
 from app import db
 import json
+import logging
 
 games_upcoming_bp = Blueprint('games_upcoming', __name__)
 
+logger = logging.getLogger(__name__)
+
 # RAWG API configuration
 RAWG_API_KEY = os.getenv('RAWG_API_KEY')
 RAWG_API_BASE_URL = 'https://api.rawg.io/api'
@@ -149,7 +152,7 @@ def get_game_details(game_id):
         }
         
     except Exception as e:
-        print(f"Error getting game details for {game_id}: {str(e)}")
+        logger.warning("Error getting RAWG game details", extra={'rawg_game_id': game_id, 'error': str(e)})
         return {'website': None, 'youtube_trailer': None}
 
 def should_refresh_upcoming_cache():
@@ -171,20 +174,17 @@ def should_refresh_upcoming_cache():
 def get_upcoming_games():
     """Get upcoming games with release dates"""
     try:
-        print(f"Upcoming games cache status: {len(upcoming_games_cache['games'])} games, last updated: {upcoming_games_cache['last_updated']}")
-        print(f"Should refresh: {should_refresh_upcoming_cache()}")
-        
         # Check if we need to refresh the cache
         if should_refresh_upcoming_cache():
-            print("Refreshing upcoming games cache...")
+            logger.info("Refreshing upcoming games cache", extra={'last_updated': upcoming_games_cache['last_updated']})
             result = search_upcoming_games()
             
             if 'error' not in result:
                 upcoming_games_cache['games'] = result['games']
                 upcoming_games_cache['last_updated'] = datetime.utcnow().isoformat()
-                print(f"Cache refreshed with {len(result['games'])} upcoming games")
+                logger.info("Upcoming games cache refreshed", extra={'game_count': len(result['games'])})
             else:
-                print(f"API error: {result['error']}")
+                logger.warning("RAWG API error", extra={'error': result['error']})
                 # If API fails, return cached games if available
                 if upcoming_games_cache['games']:
                     return jsonify({
@@ -199,7 +199,7 @@ def get_upcoming_games():
                         'message': result['error']
                     }), 500
         else:
-            print("Using cached upcoming games")
+            logger.debug("Using cached upcoming games", extra={'game_count': len(upcoming_games_cache['games'])})
         
         return jsonify({
             'success': True,
@@ -209,7 +209,7 @@ def get_upcoming_games():
         }), 200
         
     except Exception as e:
-        print(f"Error in get_upcoming_games: {str(e)}")
+        logger.exception("Failed to get upcoming games")
         return jsonify({
             'success': False,
             'message': f'Failed to get upcoming games: {str(e)}'
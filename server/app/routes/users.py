@@ -2,8 +2,9 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from marshmallow import Schema, fields, ValidationError
 from app import db
-from app.models import User, Follow, UserGame
+from app.models import User, Follow, UserGame, UserLibraryStats, UserLibraryVersion, Game
 from app.utils.rate_limiter import rate_limit, search_limiter, api_limiter
+from app.utils.etags import version_etag, not_modified, with_etag
 import re
 
 users_bp = Blueprint('users', __name__)
@@ -67,6 +68,15 @@ def get_user_profile(user_id):
     """Get a user's public profile"""
     try:
         current_user_id = int(get_jwt_identity())
+        
+        try:
+            game_fields = Game.resolve_fields(request.args.get('view'), request.args.get('fields'))
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'message': str(e)
+            }), 400
+        
         user = User.query.get(user_id)
         
         if not user or not user.is_active:
@@ -83,13 +93,21 @@ def get_user_profile(user_id):
         profile_data['follower_count'] = user.get_follower_count()
         profile_data['following_count'] = user.get_following_count()
         
+        # Library and shared flags only change with either user's library version
+        versions = UserLibraryVersion.versions([user_id, current_user_id])
+        etag = version_etag(current_user_id, profile_data, versions[user_id], versions[current_user_id])
+        cached = not_modified(etag)
+        if cached is not None:
+            return cached
+        
         # Get user's game library (public view)
-        user_games = UserGame.query.filter_by(user_id=user_id).all()
-        library = [game.to_dict() for game in user_games]
+        user_games = UserGame.query.options(UserGame.game_loader(game_fields)).filter_by(user_id=user_id).all()
+        library = [game.to_dict(game_fields) for game in user_games]
         
         # Get current user's library to find shared games
-        current_user_games = UserGame.query.filter_by(user_id=current_user_id).all()
-        current_user_game_ids = {game.game_id for game in current_user_games}
+        current_user_game_ids = {
+            game_id for (game_id,) in db.session.query(UserGame.game_id).filter_by(user_id=current_user_id)
+        }
         
         # Mark shared games
         shared_count = 0
@@ -100,25 +118,16 @@ def get_user_profile(user_id):
             else:
                 game['is_shared'] = False
         
-        # Calculate some stats
-        stats = {
-            'total_games': len(library),
-            'completed': len([g for g in library if g['status'] == 'completed']),
-            'currently_playing': len([g for g in library if g['status'] == 'playing']),
-            'want_to_play': len([g for g in library if g['status'] == 'want_to_play']),
-            'collection': len([g for g in library if g['status'] == 'collection']),
-            'dropped': len([g for g in library if g['status'] == 'dropped']),
-            'average_rating': sum([g['rating'] for g in library if g['rating']]) / len([g for g in library if g['rating']]) if any(g['rating'] for g in library) else 0,
-            'total_hours': sum([g['hours_played'] for g in library if g['hours_played']]) if any(g['hours_played'] for g in library) else 0,
-            'shared_games': shared_count
-        }
+        # Maintained library totals (a single row read)
+        stats = UserLibraryStats.for_user(user_id).to_dict()
+        stats['shared_games'] = shared_count
         
-        return jsonify({
+        return with_etag(jsonify({
             'success': True,
             'user': profile_data,
             'library': library,
             'stats': stats
-        }), 200
+        }), etag), 200
         
     except Exception as e:
         return jsonify({
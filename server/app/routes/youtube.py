@@ -5,9 +5,12 @@ import os
 from datetime import datetime, timedelta
 from app import db
 import json
+import logging
 
 youtube_bp = Blueprint('youtube', __name__)
 
+logger = logging.getLogger(__name__)
+
 # YouTube Data API configuration
 YOUTUBE_API_KEY = os.getenv('YOUTUBE_API_KEY')
 YOUTUBE_API_BASE_URL = 'https://www.googleapis.com/youtube/v3'
@@ -99,7 +102,7 @@ def search_gaming_review_videos(max_results=12):
                         all_videos.append(video)
                         
         except requests.exceptions.RequestException as e:
-            print(f"Error fetching videos from {channel_name}: {str(e)}")
+            logger.warning("Error fetching YouTube videos", extra={'channel': channel_name, 'error': str(e)})
             continue
     
     if not all_videos:
@@ -159,20 +162,17 @@ def should_refresh_cache():
 def get_daily_reviews():
     """Get daily gaming review videos"""
     try:
-        print(f"Cache status: {len(daily_videos_cache['videos'])} videos, last updated: {daily_videos_cache['last_updated']}")
-        print(f"Should refresh: {should_refresh_cache()}")
-        
         # Check if we need to refresh the cache
         if should_refresh_cache():
-            print("Refreshing cache...")
+            logger.info("Refreshing daily videos cache", extra={'last_updated': daily_videos_cache['last_updated']})
             result = search_gaming_review_videos()
             
             if 'error' not in result:
                 daily_videos_cache['videos'] = result['videos']
                 daily_videos_cache['last_updated'] = datetime.utcnow().isoformat()
-                print(f"Cache refreshed with {len(result['videos'])} videos")
+                logger.info("Daily videos cache refreshed", extra={'video_count': len(result['videos'])})
             else:
-                print(f"API error: {result['error']}")
+                logger.warning("YouTube API error", extra={'error': result['error']})
                 # If API fails, return cached videos if available
                 if daily_videos_cache['videos']:
                     return jsonify({
@@ -187,7 +187,7 @@ def get_daily_reviews():
                         'message': result['error']
                     }), 500
         else:
-            print("Using cached videos")
+            logger.debug("Using cached daily videos", extra={'video_count': len(daily_videos_cache['videos'])})
         
         return jsonify({
             'success': True,
@@ -197,7 +197,7 @@ def get_daily_reviews():
         }), 200
         
     except Exception as e:
-        print(f"Error in get_daily_reviews: {str(e)}")
+        logger.exception("Failed to get daily reviews")
         return jsonify({
             'success': False,
             'message': f'Failed to get daily reviews: {str(e)}'
@@ -0,0 +1,214 @@
+"""
+Non-blocking structured logging
+
+Records are handed to a bounded in-memory queue and written to stdout by a
+background listener thread, so request threads never wait on log I/O (when
+the queue is full, records are dropped and counted instead). Structured
+fields passed with extra={...}, plus the current route, method and user id,
+are emitted as JSON (LOG_FORMAT=json, the production default) or key=value
+text.
+
+Environment:
+    LOG_LEVEL              root level (default INFO)
+    LOG_LEVELS             per-module levels, e.g. "app.routes.games=DEBUG,sqlalchemy.engine=WARNING"
+    LOG_FORMAT             json or text
+    LOG_DEBUG_SAMPLE_RATE  fraction of DEBUG records kept (default 1.0)
+    LOG_QUEUE_SIZE         records buffered before dropping (default 10000)
+    LOG_SLOW_REQUEST_MS    requests slower than this are logged at INFO, others at DEBUG (default 1000)
+"""
+
+import atexit
+import copy
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+from flask import g, has_request_context, request
+
+# Attributes every LogRecord has; anything else came from extra={...}
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+class RequestContextFilter(logging.Filter):
+    """Attach route, method and user id of the current request (runs in the request thread)"""
+
+    def filter(self, record):
+        if has_request_context():
+            if not hasattr(record, 'route'):
+                record.route = request.url_rule.rule if request.url_rule else request.path
+            if not hasattr(record, 'method'):
+                record.method = request.method
+            if not hasattr(record, 'user_id'):
+                record.user_id = _current_user_id()
+        return True
+
+class DebugSamplingFilter(logging.Filter):
+    """Keep only a fraction of DEBUG records so debug logging on hot paths stays cheap"""
+
+    def __init__(self, rate):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        return record.levelno > logging.DEBUG or self.rate >= 1 or random.random() < self.rate
+
+# Renders tracebacks in NonBlockingQueueHandler.prepare
+_exception_formatter = logging.Formatter()
+
+class NonBlockingQueueHandler(QueueHandler):
+    """QueueHandler that drops records when the queue is full instead of blocking or erroring"""
+
+    def __init__(self, log_queue, listener_factory):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._listener_factory = listener_factory
+        self._listener = None
+        self._listener_pid = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start the writer thread for this process (again after a fork)"""
+        with self._lock:
+            if self._listener_pid != os.getpid():
+                self._listener = self._listener_factory(self.queue)
+                self._listener.start()
+                self._listener_pid = os.getpid()
+
+    def stop(self):
+        with self._lock:
+            if self._listener is not None and self._listener_pid == os.getpid():
+                self._listener.stop()
+            self._listener = None
+            self._listener_pid = None
+
+    def enqueue(self, record):
+        if self._listener_pid != os.getpid():
+            self.start()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def prepare(self, record):
+        """
+        Copy the record for the queue, leaving message formatting to the
+        listener. Only the traceback is rendered here (to exc_text), since it
+        must be captured before the request thread moves on.
+        """
+        record = copy.copy(record)
+        if record.exc_info:
+            record.exc_text = _exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+class StructuredFormatter(logging.Formatter):
+    """Render a record and its structured fields as JSON or key=value text"""
+
+    def __init__(self, output='text'):
+        super().__init__()
+        self.output = output
+
+    def format(self, record):
+        fields = {
+            key: value for key, value in vars(record).items()
+            if key not in _RECORD_ATTRIBUTES and not key.startswith('_')
+        }
+        message = record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            fields['exception'] = record.exc_text
+        timestamp = datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds')
+        if self.output == 'json':
+            return json.dumps({
+                'ts': timestamp,
+                'level': record.levelname,
+                'logger': record.name,
+                'message': message,
+                **fields
+            }, default=str)
+        text = ' '.join(f'{key}={value}' for key, value in fields.items() if key != 'exception')
+        line = f"{timestamp} {record.levelname} {record.name}: {message}" + (f" | {text}" if text else '')
+        if 'exception' in fields:
+            line += '\n' + fields['exception']
+        return line
+
+def _current_user_id():
+    """JWT identity of the current request if it was verified, else None"""
+    try:
+        from flask_jwt_extended import get_jwt_identity
+        return get_jwt_identity()
+    except Exception:
+        return None
+
+def _parse_levels(spec):
+    """'a.b=DEBUG,c=WARNING' -> {'a.b': 'DEBUG', 'c': 'WARNING'}"""
+    levels = {}
+    for item in (spec or '').split(','):
+        name, _, level = item.partition('=')
+        if name.strip() and level.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+_handler = None
+
+def configure_logging(app):
+    """Route all logging through the background writer and add request timing hooks"""
+    global _handler
+    is_production = os.getenv('FLASK_ENV') == 'production'
+
+    if _handler is None:
+        formatter = StructuredFormatter(os.getenv('LOG_FORMAT', 'json' if is_production else 'text'))
+
+        def make_listener(log_queue):
+            stream_handler = logging.StreamHandler(sys.stdout)
+            stream_handler.setFormatter(formatter)
+            return QueueListener(log_queue, stream_handler, respect_handler_level=False)
+
+        _handler = NonBlockingQueueHandler(queue.Queue(maxsize=int(os.getenv('LOG_QUEUE_SIZE', 10000))), make_listener)
+        _handler.addFilter(DebugSamplingFilter(float(os.getenv('LOG_DEBUG_SAMPLE_RATE', 1.0))))
+        _handler.addFilter(RequestContextFilter())
+        _handler.start()
+        atexit.register(_handler.stop)  # Flush queued records on shutdown
+
+        root = logging.getLogger()
+        for existing in list(root.handlers):
+            root.removeHandler(existing)
+        root.addHandler(_handler)
+        root.setLevel(os.getenv('LOG_LEVEL', 'INFO').upper())
+        for name, level in _parse_levels(os.getenv('LOG_LEVELS')).items():
+            logging.getLogger(name).setLevel(level)
+
+    slow_request_ms = float(os.getenv('LOG_SLOW_REQUEST_MS', 1000))
+    request_logger = logging.getLogger('app.requests')
+
+    @app.before_request
+    def start_request_timer():
+        g.request_started = time.perf_counter()
+
+    @app.after_request
+    def log_request(response):
+        started = g.pop('request_started', None)
+        if started is None:
+            return response
+        duration_ms = round((time.perf_counter() - started) * 1000, 1)
+        level = logging.INFO if duration_ms >= slow_request_ms else logging.DEBUG
+        if request_logger.isEnabledFor(level):
+            request_logger.log(level, 'request', extra={'status': response.status_code, 'duration_ms': duration_ms})
+        return response
+
+def logging_stats():
+    """Queue depth and dropped record count"""
+    if _handler is None:
+        return {'configured': False}
+    return {
+        'configured': True,
+        'queued': _handler.queue.qsize(),
+        'dropped': _handler.dropped
+    }
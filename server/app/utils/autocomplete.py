@@ -0,0 +1,133 @@
+"""
+In-process autocomplete index for game names and aliases
+
+Keys are normalized titles kept in sorted arrays, so a prefix lookup is a
+bisect plus a short forward scan. Full names and aliases live in the primary
+array; the tails of multi-word names ("zelda breath of the wild") live in a
+secondary array that is only consulted when the primary one runs short.
+"""
+
+import logging
+import threading
+from bisect import bisect_left, insort
+
+from app.utils.images import image_url
+from app.utils.normalize import normalize_title, split_aliases
+
+logger = logging.getLogger(__name__)
+
+class AutocompleteIndex:
+    def __init__(self, max_results=10):
+        self.max_results = max_results
+        self._primary = []   # sorted (key, game_id)
+        self._words = []     # sorted (key, game_id) for inner word starts
+        self._games = {}     # game_id -> (guid, name, thumb_url, primary_keys, word_keys)
+        self._lock = threading.Lock()
+        self.loaded = False
+
+    @staticmethod
+    def _keys_for(name, aliases):
+        primary = set()
+        words = set()
+        normalized_name = normalize_title(name)
+        if normalized_name:
+            primary.add(normalized_name)
+            parts = normalized_name.split(' ')
+            for i in range(1, len(parts)):
+                words.add(' '.join(parts[i:]))
+        for alias in split_aliases(aliases):
+            normalized_alias = normalize_title(alias)
+            if normalized_alias:
+                primary.add(normalized_alias)
+        return primary, words - primary
+
+    def load(self, rows):
+        """Rebuild the index from (id, guid, name, thumb_url, aliases) rows"""
+        primary = []
+        words = []
+        games = {}
+        for game_id, guid, name, thumb_url, aliases in rows:
+            primary_keys, word_keys = self._keys_for(name, aliases)
+            games[game_id] = (guid, name, thumb_url, primary_keys, word_keys)
+            primary.extend((key, game_id) for key in primary_keys)
+            words.extend((key, game_id) for key in word_keys)
+        primary.sort()
+        words.sort()
+        with self._lock:
+            self._primary = primary
+            self._words = words
+            self._games = games
+            self.loaded = True
+
+    def load_from_db(self):
+        """Build the index from the games table"""
+        from app import db
+        from app.models import Game
+
+        rows = db.session.query(
+            Game.id, Game.guid, Game.name, Game.image_path, Game.image_overrides, Game.aliases
+        ).yield_per(5000)
+        self.load(
+            (game_id, guid, name, image_url(image_path, image_overrides, 'thumb_url'), aliases)
+            for game_id, guid, name, image_path, image_overrides, aliases in rows
+        )
+        logger.info(f"Autocomplete index loaded with {len(self._games)} games")
+
+    def add_game(self, game):
+        """Index a newly cached game (or re-index one whose name/aliases changed)"""
+        primary_keys, word_keys = self._keys_for(game.name, game.aliases)
+        with self._lock:
+            self._remove_locked(game.id)
+            self._games[game.id] = (game.guid, game.name, game.image_variant('thumb_url'), primary_keys, word_keys)
+            for key in primary_keys:
+                insort(self._primary, (key, game.id))
+            for key in word_keys:
+                insort(self._words, (key, game.id))
+
+    def _remove_locked(self, game_id):
+        entry = self._games.pop(game_id, None)
+        if not entry:
+            return
+        for keys, array in ((entry[3], self._primary), (entry[4], self._words)):
+            for key in keys:
+                index = bisect_left(array, (key, game_id))
+                if index < len(array) and array[index] == (key, game_id):
+                    del array[index]
+
+    @staticmethod
+    def _scan(array, prefix, seen, results, limit):
+        index = bisect_left(array, (prefix,))
+        while index < len(array) and len(results) < limit:
+            key, game_id = array[index]
+            if not key.startswith(prefix):
+                break
+            if game_id not in seen:
+                seen.add(game_id)
+                results.append(game_id)
+            index += 1
+
+    def suggest(self, query, limit=None):
+        """Return up to `limit` suggestions whose name or alias starts with the query"""
+        limit = min(limit or self.max_results, self.max_results)
+        prefix = normalize_title(query)
+        if not prefix:
+            return []
+
+        seen = set()
+        results = []
+        with self._lock:
+            self._scan(self._primary, prefix, seen, results, limit)
+            if len(results) < limit:
+                self._scan(self._words, prefix, seen, results, limit)
+            entries = [self._games[game_id] for game_id in results]
+
+        return [
+            {'guid': entry[0], 'name': entry[1], 'thumb_url': entry[2]}
+            for entry in entries
+        ]
+
+    def __len__(self):
+        return len(self._games)
+
+# Global autocomplete index instance
+autocomplete_index = AutocompleteIndex(max_results=20)
@@ -0,0 +1,25 @@
+import base64
+import json
+
+def encode_cursor(*values):
+    """Encode keyset position values as an opaque URL-safe token"""
+    raw = json.dumps(list(values), separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_cursor(token, types):
+    """
+    Decode a token produced by encode_cursor. `types` gives the expected type
+    (or tuple of types) of each position; raises ValueError if it is malformed.
+    """
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except Exception:
+        raise ValueError('Invalid cursor')
+    if not isinstance(values, list) or len(values) != len(types):
+        raise ValueError('Invalid cursor')
+    for value, expected in zip(values, types):
+        # bool is an int subclass but never a valid position value
+        if isinstance(value, bool) or not isinstance(value, expected):
+            raise ValueError('Invalid cursor')
+    return values
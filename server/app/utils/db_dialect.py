@@ -0,0 +1,22 @@
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app import db
+
+# Dialects whose INSERT supports ON CONFLICT ... DO NOTHING/UPDATE and RETURNING
+UPSERT_INSERTS = {
+    'postgresql': postgresql.insert,
+    'sqlite': sqlite.insert
+}
+
+def upsert_insert(model):
+    """Dialect-specific INSERT for model supporting on_conflict_*, or None if unsupported"""
+    insert = UPSERT_INSERTS.get(db.engine.dialect.name)
+    return insert(model) if insert else None
+
+# Bind parameters one statement may carry: SQLite's default SQLITE_MAX_VARIABLE_NUMBER
+# (PostgreSQL allows 65535)
+MAX_BIND_PARAMETERS = 32766
+
+def rows_per_statement(table):
+    """Most rows of `table` one multi-row INSERT ... VALUES can carry within MAX_BIND_PARAMETERS"""
+    return max(1, MAX_BIND_PARAMETERS // len(table.columns))
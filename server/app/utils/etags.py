@@ -0,0 +1,30 @@
+"""
+Conditional GET helpers
+
+An ETag is derived from the request path, its query string and whatever
+version values the response depends on, so the check can be done before any
+expensive query. Responses carry Cache-Control: private, no-cache so
+browsers always revalidate instead of showing a stale copy.
+"""
+
+import hashlib
+import json
+
+from flask import Response, request
+
+def version_etag(*versions):
+    """Strong ETag for the current URL at the given versions"""
+    parts = [request.path, sorted(request.args.items(multi=True)), *versions]
+    return hashlib.sha1(json.dumps(parts, default=str).encode('utf-8')).hexdigest()
+
+def not_modified(etag):
+    """A 304 response if the client already holds this version, else None"""
+    if not request.if_none_match.contains(etag):
+        return None
+    return with_etag(Response(status=304), etag)
+
+def with_etag(response, etag):
+    """Attach the ETag and revalidation headers to a response"""
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
@@ -0,0 +1,273 @@
+"""
+Typo-tolerant matching for game names and aliases
+
+Words from every name and alias form a vocabulary with a character-trigram
+inverted index over it. A query word only computes edit distances against
+vocabulary words that share enough trigrams with it, so the cost scales with
+the number of candidates rather than the size of the catalog.
+"""
+
+import heapq
+import logging
+import threading
+from bisect import bisect_left, insort
+from collections import defaultdict
+
+from app.utils.normalize import normalize_title, split_aliases
+
+logger = logging.getLogger(__name__)
+
+def trigrams(word):
+    """Character trigrams of a word padded with boundary markers"""
+    padded = f'  {word} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def max_edits(word):
+    """Edit distance tolerated for a query word of this length"""
+    if len(word) <= 2:
+        return 0
+    if len(word) <= 5:
+        return 1
+    return 2
+
+# Largest value max_edits returns
+MAX_EDITS = 2
+
+def bounded_edit_distance(a, b, limit):
+    """
+    Edit distance between a and b counting an adjacent transposition as one
+    edit ("zelad" -> "zelda"), or limit + 1 if it exceeds limit
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    before_previous = None
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i] + [0] * len(b)
+        row_min = i
+        for j, char_b in enumerate(b, 1):
+            current[j] = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b)
+            )
+            if i > 1 and j > 1 and char_a == b[j - 2] and a[i - 2] == char_b:
+                current[j] = min(current[j], before_previous[j - 2] + 1)
+            row_min = min(row_min, current[j])
+        if row_min > limit:
+            return limit + 1
+        before_previous, previous = previous, current
+    return previous[-1] if previous[-1] <= limit else limit + 1
+
+def query_fuzzy_matches_game(query, name, aliases=None):
+    """Whether every query word is within its edit budget of (or a prefix of) a word of the game"""
+    tokens = normalize_title(query).split()
+    if not tokens:
+        return False
+    words = FuzzyIndex._words_for(name, aliases)
+    return all(
+        any(word.startswith(token) or bounded_edit_distance(token, word, max_edits(token)) <= max_edits(token)
+            for word in words)
+        for token in tokens
+    )
+
+def _deletions(word, depth):
+    """word plus every string left after deleting up to depth of its characters"""
+    variants = frontier = {word}
+    for _ in range(depth):
+        frontier = {variant[:i] + variant[i + 1:] for variant in frontier for i in range(len(variant))}
+        variants = variants | frontier
+    return variants
+
+def fuzzy_titles_matcher(titles):
+    """
+    Predicate telling whether a fuzzy query could match any of a batch of
+    (name, aliases) titles, with false positives but no misses compared with
+    query_fuzzy_matches_game. Two words within k edits (transpositions
+    included) share a string reachable by at most k deletions from each, so
+    edit distances are replaced by set lookups.
+    """
+    words = sorted(set().union(*(FuzzyIndex._words_for(name, aliases) for name, aliases in titles)))
+    variants = set()
+    for word in words:
+        variants |= _deletions(word, MAX_EDITS)
+    token_results = {}
+
+    def token_matches(token):
+        if token not in token_results:
+            position = bisect_left(words, token)
+            edits = max_edits(token)
+            token_results[token] = (
+                (position < len(words) and words[position].startswith(token))
+                or (edits > 0 and not variants.isdisjoint(_deletions(token, edits)))
+            )
+        return token_results[token]
+
+    def matches(query):
+        tokens = normalize_title(query).split()
+        return bool(tokens) and all(token_matches(token) for token in tokens)
+    return matches
+
+class FuzzyIndex:
+    def __init__(self, max_candidates=200):
+        self.max_candidates = max_candidates
+        self._word_games = defaultdict(set)   # word -> game ids
+        self._trigram_words = defaultdict(set)  # trigram -> words
+        self._sorted_words = []               # vocabulary for prefix lookups
+        self._game_words = {}                 # game id -> words
+        self._lock = threading.Lock()
+        self.loaded = False
+
+    @staticmethod
+    def _words_for(name, aliases):
+        words = set(normalize_title(name).split())
+        for alias in split_aliases(aliases):
+            words.update(normalize_title(alias).split())
+        words.discard('')
+        return words
+
+    def _add_locked(self, game_id, words):
+        self._game_words[game_id] = words
+        for word in words:
+            games = self._word_games[word]
+            if not games:
+                for trigram in trigrams(word):
+                    self._trigram_words[trigram].add(word)
+                insort(self._sorted_words, word)
+            games.add(game_id)
+
+    def _remove_locked(self, game_id):
+        for word in self._game_words.pop(game_id, ()):
+            games = self._word_games.get(word)
+            if games is None:
+                continue
+            games.discard(game_id)
+            if not games:
+                del self._word_games[word]
+                for trigram in trigrams(word):
+                    self._trigram_words[trigram].discard(word)
+                index = bisect_left(self._sorted_words, word)
+                if index < len(self._sorted_words) and self._sorted_words[index] == word:
+                    del self._sorted_words[index]
+
+    def load_from_db(self):
+        """Build the index from the games table"""
+        from app import db
+        from app.models import Game
+
+        with self._lock:
+            self._word_games.clear()
+            self._trigram_words.clear()
+            self._game_words.clear()
+            self._sorted_words = []
+            rows = db.session.query(Game.id, Game.name, Game.aliases).yield_per(5000)
+            for game_id, name, aliases in rows:
+                words = self._words_for(name, aliases)
+                self._game_words[game_id] = words
+                for word in words:
+                    self._word_games[word].add(game_id)
+            for word in self._word_games:
+                for trigram in trigrams(word):
+                    self._trigram_words[trigram].add(word)
+            self._sorted_words = sorted(self._word_games)
+            self.loaded = True
+        logger.info(f"Fuzzy index loaded with {len(self._word_games)} words")
+
+    def add_game(self, game):
+        """Index a newly cached game (or re-index one whose name/aliases changed)"""
+        words = self._words_for(game.name, game.aliases)
+        with self._lock:
+            self._remove_locked(game.id)
+            self._add_locked(game.id, words)
+
+    def _matching_words(self, token, allow_prefix=False):
+        """Vocabulary words within the edit budget of token -> distance"""
+        limit = max_edits(token)
+        matches = {}
+        if token in self._word_games:
+            matches[token] = 0
+
+        if allow_prefix:
+            index = bisect_left(self._sorted_words, token)
+            while index < len(self._sorted_words) and len(matches) < self.max_candidates:
+                word = self._sorted_words[index]
+                if not word.startswith(token):
+                    break
+                matches.setdefault(word, 0)
+                index += 1
+
+        if limit == 0:
+            return matches
+
+        # An edit destroys at most three padded trigrams, a transposition four
+        token_trigrams = trigrams(token)
+        required = max(1, len(token_trigrams) - 4 * limit)
+        overlap = defaultdict(int)
+        for trigram in token_trigrams:
+            for word in self._trigram_words.get(trigram, ()):
+                overlap[word] += 1
+
+        candidates = sorted(
+            (word for word, count in overlap.items() if count >= required and word not in matches),
+            key=lambda word: -overlap[word]
+        )[:self.max_candidates]
+        for word in candidates:
+            distance = bounded_edit_distance(token, word, limit)
+            if distance <= limit:
+                matches[word] = distance
+        return matches
+
+    def search(self, query, limit=10):
+        """Return up to `limit` (game_id, total_distance) pairs, closest first"""
+        tokens = normalize_title(query).split()
+        if not tokens:
+            return []
+
+        with self._lock:
+            scores = None
+            for position, token in enumerate(tokens):
+                matches = self._matching_words(token, allow_prefix=position == len(tokens) - 1)
+                token_scores = {}
+                for word, distance in matches.items():
+                    for game_id in self._word_games[word]:
+                        if distance < token_scores.get(game_id, distance + 1):
+                            token_scores[game_id] = distance
+                if scores is None:
+                    scores = token_scores
+                else:
+                    scores = {
+                        game_id: score + token_scores[game_id]
+                        for game_id, score in scores.items() if game_id in token_scores
+                    }
+                if not scores:
+                    return []
+
+            # Ties go to games with fewer extra words (closer to the query as a whole)
+            return heapq.nsmallest(
+                limit, scores.items(), key=lambda item: (item[1], len(self._game_words[item[0]]), item[0])
+            )
+
+    def suggest(self, query):
+        """'Did you mean' text with misspelled words replaced, or None if nothing changes"""
+        tokens = normalize_title(query).split()
+        corrected = []
+        changed = False
+        with self._lock:
+            for token in tokens:
+                if token in self._word_games:
+                    corrected.append(token)
+                    continue
+                matches = self._matching_words(token)
+                if not matches:
+                    corrected.append(token)
+                    continue
+                best = min(matches, key=lambda word: (matches[word], -len(self._word_games[word]), word))
+                corrected.append(best)
+                changed = True
+        return ' '.join(corrected) if changed else None
+
+    def __len__(self):
+        return len(self._game_words)
+
+# Global fuzzy index instance
+fuzzy_index = FuzzyIndex()
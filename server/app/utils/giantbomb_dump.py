@@ -0,0 +1,118 @@
+"""
+Incremental reader for Giant Bomb API dump files
+
+A dump is a regular API response envelope ({"status_code": 1, ..., "results": [...]})
+that can be hundreds of MB. Records are decoded one at a time with
+json.JSONDecoder.raw_decode over a sliding text buffer, so memory stays
+proportional to the read chunk rather than the file. Each record is yielded
+with the byte offset just past it, which can be passed back as `offset` to
+resume reading after that record.
+"""
+
+import codecs
+import json
+import re
+
+RESULTS_KEY_PATTERN = re.compile(r'"results"\s*:\s*\[')
+WHITESPACE = ' \t\n\r'
+
+class DumpFormatError(ValueError):
+    """The file is not a Giant Bomb envelope with a results array"""
+
+class _Buffer:
+    """Decoded text window over a binary file that tracks byte offsets as it advances"""
+
+    def __init__(self, handle, offset, chunk_size):
+        self.handle = handle
+        self.chunk_size = chunk_size
+        self.decoder = codecs.getincrementaldecoder('utf-8')()
+        self.text = ''
+        self.pos = 0
+        self.mark = 0  # Text index whose byte offset is known
+        self.mark_offset = offset
+        self.eof = False
+        handle.seek(offset)
+
+    def read_more(self):
+        """Drop consumed text and append the next chunk; False at end of file"""
+        if self.eof:
+            return False
+        if self.pos:
+            self.mark_offset = self.byte_offset()
+            self.text = self.text[self.pos:]
+            self.pos = self.mark = 0
+        chunk = self.handle.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            self.text += self.decoder.decode(b'', final=True)
+            return False
+        self.text += self.decoder.decode(chunk)
+        return True
+
+    def skip_whitespace(self):
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text) or not self.read_more():
+                return
+
+    def peek(self):
+        self.skip_whitespace()
+        return self.text[self.pos] if self.pos < len(self.text) else ''
+
+    def byte_offset(self):
+        """Byte offset of the current position in the file (the position only moves forward)"""
+        self.mark_offset += len(self.text[self.mark:self.pos].encode('utf-8'))
+        self.mark = self.pos
+        return self.mark_offset
+
+def _seek_results(buffer):
+    """Advance the buffer just past the opening bracket of the results array"""
+    while True:
+        match = RESULTS_KEY_PATTERN.search(buffer.text, buffer.pos)
+        if match:
+            buffer.pos = match.end()
+            return
+        # Keep a tail in case the key straddles two chunks
+        buffer.pos = max(buffer.pos, len(buffer.text) - 64)
+        if not buffer.read_more():
+            raise DumpFormatError('No "results" array found')
+
+def iter_dump_results(path, offset=0, chunk_size=1 << 20):
+    """
+    Yield (record, end_offset) for each entry of the dump's results array.
+    offset=0 starts from the top of the file; any other value must be an
+    end_offset previously yielded for the same file.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, 'rb') as handle:
+        buffer = _Buffer(handle, offset, chunk_size)
+        if offset == 0:
+            _seek_results(buffer)
+            first = True
+        else:
+            first = False
+
+        while True:
+            char = buffer.peek()
+            if char == ']':
+                return
+            if not char:
+                raise DumpFormatError('Unexpected end of file inside the results array')
+            if not first:
+                if char != ',':
+                    raise DumpFormatError(f"Expected ',' at byte {buffer.byte_offset()}")
+                buffer.pos += 1
+                buffer.peek()
+            first = False
+
+            while True:
+                try:
+                    record, end = decoder.raw_decode(buffer.text, buffer.pos)
+                    break
+                except json.JSONDecodeError as e:
+                    # Most likely the record continues in the next chunk
+                    if not buffer.read_more():
+                        raise DumpFormatError(f"Invalid record at byte {buffer.byte_offset()}: {e.msg}") from e
+            buffer.pos = end
+            yield record, buffer.byte_offset()
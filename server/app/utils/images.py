@@ -0,0 +1,61 @@
+"""
+Compact storage for Giant Bomb image URLs
+
+Giant Bomb serves every size of a game's cover from the same path stem, e.g.
+https://www.giantbomb.com/a/uploads/scale_medium/8/82063/2906617-box.jpg and
+https://www.giantbomb.com/a/uploads/square_mini/8/82063/2906617-box.jpg.
+Games store only the stem ("8/82063/2906617-box.jpg") and rebuild each size's
+URL from it. URLs that don't follow the pattern are kept verbatim as overrides.
+"""
+
+from collections import Counter
+
+IMAGE_HOST = 'https://www.giantbomb.com/a/uploads/'
+
+# Image dict key -> Giant Bomb size directory, in serialization order
+IMAGE_SIZES = {
+    'medium_url': 'scale_medium',
+    'thumb_url': 'scale_avatar',
+    'icon_url': 'square_avatar',
+    'small_url': 'scale_small',
+    'super_url': 'scale_large',
+    'screen_url': 'screen_medium',
+    'screen_large_url': 'screen_kubrick',
+    'tiny_url': 'square_mini'
+}
+
+def _stem(url, size):
+    prefix = f'{IMAGE_HOST}{size}/'
+    if url and url.startswith(prefix) and len(url) > len(prefix):
+        return url[len(prefix):]
+    return None
+
+def compact_image_urls(image):
+    """
+    Split a Giant Bomb image dict into (image_path, image_overrides).
+    Returns (None, None) when the dict has no URLs.
+    """
+    urls = {key: (image or {}).get(key) for key in IMAGE_SIZES}
+    if not any(urls.values()):
+        return None, None
+    stems = Counter(stem for key, url in urls.items() if (stem := _stem(url, IMAGE_SIZES[key])))
+    image_path = stems.most_common(1)[0][0] if stems else None
+    overrides = {
+        key: url for key, url in urls.items()
+        if url != (f'{IMAGE_HOST}{IMAGE_SIZES[key]}/{image_path}' if image_path else None)
+    }
+    return image_path, overrides or None
+
+def image_url(image_path, image_overrides, key):
+    """URL of one size, e.g. image_url(path, overrides, 'thumb_url')"""
+    if image_overrides and key in image_overrides:
+        return image_overrides[key]
+    if not image_path:
+        return None
+    return f'{IMAGE_HOST}{IMAGE_SIZES[key]}/{image_path}'
+
+def expand_image_urls(image_path, image_overrides):
+    """Giant Bomb style image dict, or None if the game has no images"""
+    if not image_path and not image_overrides:
+        return None
+    return {key: image_url(image_path, image_overrides, key) for key in IMAGE_SIZES}
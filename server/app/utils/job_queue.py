@@ -0,0 +1,113 @@
+"""
+Bounded in-process background job queue
+
+Jobs run on a small pool of daemon worker threads, each inside its own app
+context (and therefore its own database session). The pending queue has a
+fixed size: submit() raises QueueFull instead of buffering without limit,
+so callers can shed load. Job status is kept in a TTL cache for polling.
+Pending jobs live only in this process and are lost if it exits.
+"""
+
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+
+from app.utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+class QueueFull(Exception):
+    """The job queue has no room for more work"""
+
+class JobQueue:
+    def __init__(self, workers=2, max_pending=100, status_ttl_seconds=600):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._jobs = TTLCache(max_entries=max(1000, max_pending * 10), ttl_seconds=status_ttl_seconds)
+        self._threads = []
+        self._start_lock = threading.Lock()
+        self._app = None
+        self.submitted = 0
+        self.rejected = 0
+        self.completed = 0
+        self.failed = 0
+
+    def init_app(self, app):
+        """Remember the app whose context jobs run in; workers start on first submit"""
+        self._app = app
+
+    def _ensure_workers(self):
+        # Started lazily so forking servers (gunicorn --preload) start threads in each worker
+        with self._start_lock:
+            self._threads = [thread for thread in self._threads if thread.is_alive()]
+            while len(self._threads) < self.workers:
+                thread = threading.Thread(target=self._work, name=f'job-worker-{len(self._threads)}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def submit(self, fn, *args):
+        """Queue fn(*args) to run in the background and return its job id; raises QueueFull"""
+        if self._app is None:
+            raise RuntimeError('JobQueue.init_app() was not called')
+        self._ensure_workers()
+        job_id = uuid.uuid4().hex
+        job = {'id': job_id, 'status': 'queued', 'submitted_at': time.time()}
+        self._jobs.set(job_id, job)
+        try:
+            self._queue.put_nowait((job_id, fn, args))
+        except queue.Full:
+            self._jobs.set(job_id, dict(job, status='rejected'))
+            self.rejected += 1
+            raise QueueFull(f'{self.max_pending} jobs already pending')
+        self.submitted += 1
+        return job_id
+
+    def _update(self, job_id, **changes):
+        job = self._jobs.get(job_id) or {'id': job_id}
+        self._jobs.set(job_id, dict(job, **changes))
+
+    def _work(self):
+        while True:
+            job_id, fn, args = self._queue.get()
+            self._update(job_id, status='running', started_at=time.time())
+            try:
+                with self._app.app_context():
+                    result = fn(*args)
+                self._update(job_id, status='done', finished_at=time.time(), result=result)
+                self.completed += 1
+            except Exception as e:
+                logger.exception(f"Background job {job_id} failed")
+                self._update(job_id, status='failed', finished_at=time.time(), error=str(e))
+                self.failed += 1
+            finally:
+                self._queue.task_done()
+
+    def job(self, job_id):
+        """Status dict for a job, or None if unknown or expired"""
+        return self._jobs.get(job_id)
+
+    def retry_after_seconds(self):
+        """Rough wait before a rejected client should retry"""
+        return max(1, self._queue.qsize() // max(1, self.workers))
+
+    def stats(self):
+        """Return queue depth and job counters"""
+        return {
+            'workers': self.workers,
+            'pending': self._queue.qsize(),
+            'max_pending': self.max_pending,
+            'submitted': self.submitted,
+            'rejected': self.rejected,
+            'completed': self.completed,
+            'failed': self.failed
+        }
+
+# Background ingestion of Giant Bomb search results
+ingest_queue = JobQueue(
+    workers=int(os.getenv('INGEST_WORKERS', 2)),
+    max_pending=int(os.getenv('INGEST_QUEUE_SIZE', 100))
+)
@@ -0,0 +1,18 @@
+import re
+import unicodedata
+
+NON_WORD_PATTERN = re.compile(r'[\W_]+', re.UNICODE)
+
+def normalize_title(value):
+    """Lowercase, strip accents and collapse punctuation/whitespace to single spaces"""
+    if not value:
+        return ''
+    decomposed = unicodedata.normalize('NFKD', value)
+    stripped = ''.join(ch for ch in decomposed if not unicodedata.combining(ch)).lower()
+    return NON_WORD_PATTERN.sub(' ', stripped).strip()
+
+def split_aliases(aliases):
+    """Split Giant Bomb's newline-separated aliases field into a list"""
+    if not aliases:
+        return []
+    return [alias.strip() for alias in aliases.splitlines() if alias.strip()]
@@ -0,0 +1,267 @@
+"""
+Text search index for the local game catalog
+
+On PostgreSQL the index is a pair of GIN indexes (pg_trgm over the lowercased
+name for substring matches, tsvector over name + aliases for word matches).
+On SQLite it is a pair of FTS5 external-content shadow tables (word prefixes
+over name + aliases, trigrams over the name for substring matches) kept in
+sync with the games table by triggers, so every insert made by
+cache_game_from_api_data is indexed in the same transaction. Any other backend
+falls back to ILIKE.
+"""
+
+import logging
+import re
+import unicodedata
+from bisect import bisect_left
+from sqlalchemy import Integer, and_, case, func, literal_column, or_, text
+
+from app import db
+from app.models import Game
+from app.utils.cursors import encode_cursor, decode_cursor
+
+logger = logging.getLogger(__name__)
+
+# Relevance tiers, lower is better
+RANK_EXACT = 0
+RANK_PREFIX = 1
+RANK_SUBSTRING = 2
+RANK_WORD = 3
+
+TOKEN_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+# Expression shared by the PostgreSQL index and the queries that must use it
+PG_TSVECTOR_SQL = "to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(aliases, ''))"
+
+SQLITE_FTS_SETUP = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS games_fts
+    USING fts5(name, aliases, content='games', content_rowid='id')
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS games_fts_ai AFTER INSERT ON games BEGIN
+        INSERT INTO games_fts(rowid, name, aliases) VALUES (new.id, new.name, new.aliases);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS games_fts_ad AFTER DELETE ON games BEGIN
+        INSERT INTO games_fts(games_fts, rowid, name, aliases) VALUES ('delete', old.id, old.name, old.aliases);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS games_fts_au AFTER UPDATE OF name, aliases ON games BEGIN
+        INSERT INTO games_fts(games_fts, rowid, name, aliases) VALUES ('delete', old.id, old.name, old.aliases);
+        INSERT INTO games_fts(rowid, name, aliases) VALUES (new.id, new.name, new.aliases);
+    END
+    """,
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS games_name_trgm
+    USING fts5(name, content='games', content_rowid='id', tokenize='trigram')
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS games_name_trgm_ai AFTER INSERT ON games BEGIN
+        INSERT INTO games_name_trgm(rowid, name) VALUES (new.id, new.name);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS games_name_trgm_ad AFTER DELETE ON games BEGIN
+        INSERT INTO games_name_trgm(games_name_trgm, rowid, name) VALUES ('delete', old.id, old.name);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS games_name_trgm_au AFTER UPDATE OF name ON games BEGIN
+        INSERT INTO games_name_trgm(games_name_trgm, rowid, name) VALUES ('delete', old.id, old.name);
+        INSERT INTO games_name_trgm(rowid, name) VALUES (new.id, new.name);
+    END
+    """
+]
+
+# SQLite FTS5 tables built by SQLITE_FTS_SETUP
+SQLITE_FTS_TABLES = ('games_fts', 'games_name_trgm')
+
+# Trigram tokens need at least this many characters
+TRIGRAM_MIN_LENGTH = 3
+
+PG_SETUP = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_games_name_trgm ON games USING gin (lower(name) gin_trgm_ops)",
+    f"CREATE INDEX IF NOT EXISTS ix_games_search_tsv ON games USING gin (({PG_TSVECTOR_SQL}))"
+]
+
+def tokenize(query):
+    """Split a search query into lowercase word tokens"""
+    return TOKEN_PATTERN.findall(query.lower())
+
+def escape_like(value):
+    """Escape LIKE wildcards so user input is matched literally"""
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+def _fold(value):
+    decomposed = unicodedata.normalize('NFKD', value.lower())
+    return ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+def query_matches_game(query, name, aliases=None):
+    """
+    Conservatively decide whether a game could appear in the results for query.
+    Used to invalidate cached searches; false positives are fine, misses are not.
+    """
+    normalized = query.strip().lower()
+    if name and normalized in name.lower():
+        return True
+    tokens = [_fold(token) for token in tokenize(normalized)]
+    if not tokens:
+        return False
+    words = tokenize(_fold(f"{name or ''} {aliases or ''}"))
+    return all(any(word.startswith(token) for word in words) for token in tokens)
+
+def titles_matcher(titles):
+    """
+    Predicate telling whether a query could match any of a batch of
+    (name, aliases) titles. Like query_matches_game it may give false
+    positives (tokens can match words of different titles) but never misses,
+    and it is cheap enough to run against every cached query.
+    """
+    names = '\n'.join(name.lower() for name, _ in titles if name)
+    words = sorted({
+        word for name, aliases in titles for word in tokenize(_fold(f"{name or ''} {aliases or ''}"))
+    })
+
+    def prefixes_a_word(token):
+        position = bisect_left(words, token)
+        return position < len(words) and words[position].startswith(token)
+
+    def matches(query):
+        normalized = query.strip().lower()
+        if names and normalized in names:
+            return True
+        tokens = [_fold(token) for token in tokenize(normalized)]
+        return bool(tokens) and all(prefixes_a_word(token) for token in tokens)
+    return matches
+
+class GameSearchIndex:
+    def __init__(self):
+        self.backend = 'like'
+
+    def init_app(self, app):
+        """Create (or verify) the text index for the configured database"""
+        dialect = db.engine.dialect.name
+        try:
+            if dialect == 'postgresql':
+                self._setup_postgresql()
+                self.backend = 'postgresql'
+            elif dialect == 'sqlite':
+                self._setup_sqlite()
+                self.backend = 'sqlite_fts'
+        except Exception as e:
+            db.session.rollback()
+            logger.warning(f"Search index unavailable on {dialect}, falling back to LIKE search: {e}")
+            self.backend = 'like'
+        logger.info(f"Game search backend: {self.backend}")
+
+    def _setup_postgresql(self):
+        for statement in PG_SETUP:
+            db.session.execute(text(statement))
+        db.session.commit()
+
+    def _setup_sqlite(self):
+        existing = {name for (name,) in db.session.execute(text(
+            "SELECT name FROM sqlite_master WHERE type='table'"
+        ))}
+        for statement in SQLITE_FTS_SETUP:
+            db.session.execute(text(statement))
+        for table in SQLITE_FTS_TABLES:
+            if table not in existing:
+                # Index rows that were cached before the shadow table existed
+                db.session.execute(text(f"INSERT INTO {table}({table}) VALUES ('rebuild')"))
+        db.session.commit()
+
+    def rebuild(self):
+        """Rebuild the index from the games table (SQLite only, PostgreSQL maintains its own)"""
+        if self.backend == 'sqlite_fts':
+            for table in SQLITE_FTS_TABLES:
+                db.session.execute(text(f"INSERT INTO {table}({table}) VALUES ('rebuild')"))
+            db.session.commit()
+
+    def rank_expression(self, query):
+        """SQL expression ranking a game name against the query (lower is better)"""
+        normalized = query.strip().lower()
+        pattern = escape_like(normalized)
+        lowered_name = func.lower(Game.name)
+        return case(
+            (lowered_name == normalized, RANK_EXACT),
+            (lowered_name.like(f'{pattern}%', escape='\\'), RANK_PREFIX),
+            (lowered_name.like(f'%{pattern}%', escape='\\'), RANK_SUBSTRING),
+            else_=RANK_WORD
+        )
+
+    def match_condition(self, query):
+        """SQL condition selecting games that match the query through the index"""
+        normalized = query.strip().lower()
+        tokens = tokenize(normalized)
+        substring = func.lower(Game.name).like(f'%{escape_like(normalized)}%', escape='\\')
+
+        if not tokens or self.backend == 'like':
+            return substring
+
+        if self.backend == 'postgresql':
+            tsquery = ' & '.join(f'{token}:*' for token in tokens)
+            word_match = literal_column(PG_TSVECTOR_SQL).op('@@')(func.to_tsquery('simple', tsquery))
+            return or_(substring, word_match)
+
+        # SQLite FTS5: every token must prefix-match a word in name or aliases, or
+        # the name contains the query (mid-word matches such as "ario" -> "Super Mario",
+        # served by the trigram table; shorter queries only match word prefixes)
+        match = ' '.join(f'"{token}"*' for token in tokens)
+        if len(normalized) < TRIGRAM_MIN_LENGTH:
+            fts_ids = text(
+                "SELECT rowid FROM games_fts WHERE games_fts MATCH :match"
+            ).bindparams(match=match)
+        else:
+            fts_ids = text(
+                "SELECT rowid FROM games_fts WHERE games_fts MATCH :match "
+                "UNION SELECT rowid FROM games_name_trgm WHERE games_name_trgm MATCH :substring"
+            ).bindparams(match=match, substring='"' + normalized.replace('"', '""') + '"')
+        return Game.id.in_(fts_ids.columns(rowid=Integer))
+
+    def search_query(self, query, fields=None, after=None):
+        """
+        Build a ranked query returning (Game, rank) rows for the search text,
+        ordered by (rank, name, id). `after` is a decoded cursor position; rows at
+        or before it are skipped with a keyset condition instead of an OFFSET.
+        """
+        rank_expr = self.rank_expression(query)
+        rank = rank_expr.label('rank')
+        search = db.session.query(Game, rank).options(*Game.load_options(fields)).filter(
+            self.match_condition(query)
+        )
+        if after is not None:
+            after_rank, after_name, after_id = after
+            search = search.filter(or_(
+                rank_expr > after_rank,
+                and_(rank_expr == after_rank, or_(
+                    Game.name > after_name,
+                    and_(Game.name == after_name, Game.id > after_id)
+                ))
+            ))
+        return search.order_by(rank, Game.name, Game.id)
+
+    def search(self, query, limit=10, fields=None):
+        """Return up to `limit` games matching the query, best matches first"""
+        return [game for game, _ in self.search_query(query, fields).limit(limit).all()]
+
+    def search_page(self, query, limit=10, fields=None, cursor=None):
+        """
+        Return (games, next_cursor) for one page of results. next_cursor is None
+        on the last page. Raises ValueError for a malformed cursor.
+        """
+        after = decode_cursor(cursor, ((int, float), str, int)) if cursor else None
+        rows = self.search_query(query, fields, after).limit(limit + 1).all()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last_game, last_rank = rows[-1]
+            next_cursor = encode_cursor(last_rank, last_game.name, last_game.id)
+        return [game for game, _ in rows], next_cursor
+
+# Global search index instance
+search_index = GameSearchIndex()
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Benchmark /api/games/search against synthetic catalogs on SQLite
+
+Builds (or reuses) one SQLite database per catalog size, then drives the
+search endpoints through the Flask test client with a fixed query mix and
+reports p50/p95/p99 latency per mix.
+
+SQLite does not expose a rows-scanned counter, so work per query is reported
+as virtual machine steps (in thousands, via the progress handler) together
+with the number of SQL statements and whether any plan contains a full scan
+of the games table.
+
+Usage:
+    python benchmarks/search_benchmark.py --sizes 10000 100000 1000000
+    python benchmarks/search_benchmark.py --sizes 10000 --iterations 200 --warm-cache
+"""
+
+import argparse
+import os
+import re
+import sys
+import tempfile
+import time
+
+# Add the server directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event, func
+
+from synthetic_catalog import generate_catalog
+
+QUERY_MIX = {
+    'head': ['zelda', 'mario', 'final fantasy', 'call of duty', 'elden'],
+    'short_prefix': ['ze', 'ma', 'dra', 'sha'],
+    'multi_word': ['zelda breath', 'call of duty black', 'dark souls remastered', 'shadow blade'],
+    'tail': ['neon pixel', 'hollow echo', 'samurai pirate', 'titan forest'],
+    'no_match': ['qwxz', 'zzyzx', 'xylophone hero'],
+    'fuzzy': ['zelad', 'mraio kart', 'fianl fantasy', 'castelvania'],
+    'deep_page': ['mario', 'zelda', 'shadow'],
+    'autocomplete': ['zel', 'sup', 'the leg', 'call of'],
+}
+
+FULL_SCAN_PATTERN = re.compile(r'\bSCAN (TABLE )?games\b(?!_)')
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+def build_app(db_path, size, seed, batch_size=5000):
+    """Create an app on db_path, seeding the catalog if it does not have `size` games"""
+    os.environ['DATABASE_URL'] = f'sqlite:///{db_path}'
+    from app import create_app, db
+    from app.models import Game
+    from app.routes.games import game_columns_from_api_data
+    from app.utils.autocomplete import autocomplete_index
+    from app.utils.fuzzy_index import fuzzy_index
+
+    app = create_app()
+    with app.app_context():
+        existing = db.session.query(func.count(Game.id)).scalar()
+        if existing != size:
+            if existing:
+                raise SystemExit(f"{db_path} has {existing} games, expected {size}; delete it or pass --db-dir")
+            print(f"Seeding {size} games into {db_path}...")
+            started = time.perf_counter()
+            batch = []
+            for game_data in generate_catalog(size, seed=seed):
+                batch.append(game_columns_from_api_data(game_data))
+                if len(batch) >= batch_size:
+                    db.session.execute(Game.__table__.insert(), batch)
+                    db.session.commit()
+                    batch = []
+            if batch:
+                db.session.execute(Game.__table__.insert(), batch)
+                db.session.commit()
+            print(f"Seeded in {time.perf_counter() - started:.1f}s")
+
+        # In-memory indexes were built by create_app before seeding
+        started = time.perf_counter()
+        autocomplete_index.load_from_db()
+        fuzzy_index.load_from_db()
+        print(f"In-memory indexes loaded in {time.perf_counter() - started:.1f}s")
+    return app
+
+class QueryProbe:
+    """Counts statements and SQLite VM steps, and captures statements for EXPLAIN"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = []
+        self.vm_steps_k = 0
+        event.listen(engine, 'connect', self._on_connect)
+        event.listen(engine, 'before_cursor_execute', self._on_execute)
+        # Drop pooled connections so every connection gets the progress handler
+        engine.dispose()
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        dbapi_connection.set_progress_handler(self._on_progress, 1000)
+
+    def _on_progress(self):
+        self.vm_steps_k += 1
+        return 0
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append((statement, parameters))
+
+    def reset(self):
+        self.statements = []
+        self.vm_steps_k = 0
+
+    def has_full_scan(self):
+        raw = self.engine.raw_connection()
+        try:
+            cursor = raw.cursor()
+            for statement, parameters in self.statements:
+                if not statement.lstrip().upper().startswith('SELECT'):
+                    continue
+                cursor.execute(f'EXPLAIN QUERY PLAN {statement}', parameters)
+                if any(FULL_SCAN_PATTERN.search(row[-1]) for row in cursor.fetchall()):
+                    return True
+            return False
+        finally:
+            raw.close()
+
+def request_url(mix, query, client, limit):
+    """URL for one request of the mix; deep_page walks four pages first"""
+    if mix == 'autocomplete':
+        return f'/api/games/autocomplete?q={query}&limit=8'
+    if mix == 'fuzzy':
+        return f'/api/games/search?q={query}&limit={limit}&mode=fuzzy'
+    if mix == 'deep_page':
+        cursor = None
+        for _ in range(4):
+            url = f'/api/games/search?q={query}&limit={limit}' + (f'&cursor={cursor}' if cursor else '')
+            cursor = client.get(url).get_json().get('next_cursor')
+            if not cursor:
+                break
+        return f'/api/games/search?q={query}&limit={limit}' + (f'&cursor={cursor}' if cursor else '')
+    return f'/api/games/search?q={query}&limit={limit}'
+
+def run_mix(app, probe, mix, queries, iterations, limit, warm_cache):
+    """Run one query mix and return its latency/work summary"""
+    from app.routes.games import search_results_cache
+
+    client = app.test_client()
+    latencies = []
+    statements = []
+    vm_steps = []
+    full_scan = False
+    with app.app_context():
+        for iteration in range(iterations):
+            query = queries[iteration % len(queries)]
+            url = request_url(mix, query, client, limit)
+            if not warm_cache:
+                search_results_cache.clear()
+            probe.reset()
+            started = time.perf_counter()
+            response = client.get(url)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if response.status_code != 200:
+                raise RuntimeError(f"{url} returned {response.status_code}: {response.get_data(as_text=True)[:200]}")
+            statements.append(len(probe.statements))
+            vm_steps.append(probe.vm_steps_k)
+            if iteration < len(queries):
+                full_scan = full_scan or probe.has_full_scan()
+    return {
+        'mix': mix,
+        'n': iterations,
+        'p50': percentile(latencies, 50),
+        'p95': percentile(latencies, 95),
+        'p99': percentile(latencies, 99),
+        'statements': sum(statements) / len(statements),
+        'vm_steps_k': sum(vm_steps) / len(vm_steps),
+        'full_scan': full_scan,
+    }
+
+def print_report(size, results):
+    print(f"\n=== {size:,} games ===")
+    print(f"{'mix':<14}{'n':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'stmts':>8}{'vm k-steps':>12}  full scan")
+    for row in results:
+        print(
+            f"{row['mix']:<14}{row['n']:>6}{row['p50']:>10.2f}{row['p95']:>10.2f}{row['p99']:>10.2f}"
+            f"{row['statements']:>8.1f}{row['vm_steps_k']:>12.1f}  {'YES' if row['full_scan'] else 'no'}"
+        )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000])
+    parser.add_argument('--iterations', type=int, default=50, help='Requests per query mix')
+    parser.add_argument('--limit', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--mixes', nargs='+', default=list(QUERY_MIX), choices=list(QUERY_MIX))
+    parser.add_argument('--db-dir', default=os.path.join(tempfile.gettempdir(), 'game_search_bench'),
+                        help='Where catalog databases are kept between runs')
+    parser.add_argument('--warm-cache', action='store_true', help='Keep the search result cache between requests')
+    args = parser.parse_args()
+
+    os.makedirs(args.db_dir, exist_ok=True)
+    for size in args.sizes:
+        db_path = os.path.join(args.db_dir, f'catalog_{size}_{args.seed}.db')
+        app = build_app(db_path, size, args.seed)
+        from app import db
+        with app.app_context():
+            probe = QueryProbe(db.engine)
+        results = [
+            run_mix(app, probe, mix, QUERY_MIX[mix], args.iterations, args.limit, args.warm_cache)
+            for mix in args.mixes
+        ]
+        print_report(size, results)
+
+if __name__ == '__main__':
+    main()
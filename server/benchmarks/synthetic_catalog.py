@@ -0,0 +1,130 @@
+"""
+Synthetic Giant Bomb-shaped game catalog for benchmarks
+
+Titles follow a skewed distribution: a few big franchises own many entries
+(sequels, subtitles, remasters) while the long tail is made of one-off titles.
+Platform and genre arrays use the same object shape as Giant Bomb search results.
+"""
+
+import random
+from datetime import datetime, timedelta
+
+FRANCHISES = [
+    'Zelda', 'Mario', 'Final Fantasy', 'Call of Duty', 'Assassin\'s Creed', 'Pokemon', 'Resident Evil',
+    'Metal Gear', 'Elder Scrolls', 'Fallout', 'Halo', 'Sonic', 'Mega Man', 'Castlevania', 'Street Fighter',
+    'Tekken', 'Grand Theft Auto', 'Battlefield', 'Need for Speed', 'FIFA', 'Madden NFL', 'Dragon Quest',
+    'Kingdom Hearts', 'Metroid', 'Kirby', 'Donkey Kong', 'Tomb Raider', 'Silent Hill', 'Doom', 'Quake',
+    'Elden', 'Dark Souls', 'Persona', 'Yakuza', 'Tales of', 'Far Cry', 'Gears of War', 'Forza', 'Gran Turismo',
+    'Crash Bandicoot', 'Spyro', 'Ratchet & Clank', 'Uncharted', 'God of War', 'Diablo', 'StarCraft', 'Warcraft',
+    'Civilization', 'SimCity', 'The Sims', 'Mortal Kombat', 'Devil May Cry', 'Monster Hunter', 'Fire Emblem',
+]
+
+PREFIXES = ['', '', '', 'The Legend of ', 'Super ', 'New ', 'Tales of ', 'Shin ', 'Ultimate ', 'Project ']
+
+SUBTITLES = [
+    'Origins', 'Revelations', 'Legacy', 'Awakening', 'Remastered', 'Definitive Edition', 'Reborn', 'Unleashed',
+    'Breath of the Wild', 'Ocarina of Time', 'World Tour', 'Black Ops', 'Modern Warfare', 'Ghosts', 'Infinite',
+    'Rising', 'Chronicles', 'Odyssey', 'Galaxy', 'Sunshine', 'Wonder', 'Shadows', 'Twilight', 'Nightfall',
+    'Dawn', 'Eclipse', 'Vengeance', 'Dynasty', 'Heroes', 'Tactics', 'Kart', 'Party', 'Golf', 'Tennis',
+]
+
+WORDS = [
+    'Shadow', 'Blade', 'Star', 'Iron', 'Crystal', 'Dragon', 'Knight', 'Rogue', 'Galaxy', 'Quest', 'Storm',
+    'Ghost', 'Neon', 'Pixel', 'Dungeon', 'Empire', 'Frontier', 'Hollow', 'Echo', 'Titan', 'Wild', 'Zero',
+    'Sky', 'Ocean', 'Forest', 'Castle', 'Rune', 'Legend', 'Fury', 'Soul', 'Machine', 'Planet', 'Space',
+    'Racer', 'Tactics', 'Arena', 'Hunter', 'Witch', 'Samurai', 'Ninja', 'Pirate', 'Robot', 'Monster',
+]
+
+NUMERALS = ['', '', '', ' 2', ' 3', ' 4', ' II', ' III', ' IV', ' X', ' 64', ' HD']
+
+PLATFORMS = [
+    (94, 'PC', 'PC'), (146, 'PlayStation 4', 'PS4'), (176, 'PlayStation 5', 'PS5'), (145, 'Xbox One', 'XONE'),
+    (179, 'Xbox Series X|S', 'XSX'), (157, 'Nintendo Switch', 'NSW'), (35, 'PlayStation 3', 'PS3'),
+    (20, 'Xbox 360', 'X360'), (36, 'Wii', 'Wii'), (19, 'PlayStation 2', 'PS2'), (22, 'PlayStation', 'PS1'),
+    (43, 'Nintendo 64', 'N64'), (9, 'Super Nintendo Entertainment System', 'SNES'), (52, 'Nintendo DS', 'DS'),
+    (117, 'Nintendo 3DS', '3DS'), (17, 'Mac', 'MAC'), (96, 'iPhone', 'IPHN'), (123, 'Android', 'ANDR'),
+]
+
+GENRES = [
+    (1, 'Action'), (4, 'Action-Adventure'), (5, 'Role-Playing'), (2, 'Shooter'), (32, 'First-Person Shooter'),
+    (6, 'Strategy'), (9, 'Fighting'), (15, 'Real-Time Strategy'), (7, 'Racing'), (8, 'Sports'), (10, 'Puzzle'),
+    (11, 'Platformer'), (12, 'Simulation'), (13, 'Adventure'), (25, 'Music/Rhythm'), (31, 'MMORPG'),
+]
+
+def _zipf_choice(rng, items, skew=1.1):
+    """Pick from items with a Zipf-like bias towards the front of the list"""
+    index = int(len(items) * (rng.random() ** (skew * 3)))
+    return items[min(index, len(items) - 1)]
+
+def _title(rng):
+    if rng.random() < 0.45:
+        franchise = _zipf_choice(rng, FRANCHISES)
+        title = f"{rng.choice(PREFIXES)}{franchise}{rng.choice(NUMERALS)}"
+        if rng.random() < 0.6:
+            title += f": {rng.choice(SUBTITLES)}"
+        return title
+    words = rng.sample(WORDS, rng.choice([1, 2, 2, 3]))
+    title = ' '.join(words) + rng.choice(NUMERALS)
+    if rng.random() < 0.2:
+        title = f"The {title}"
+    return title
+
+def _aliases(rng, title):
+    if rng.random() > 0.3:
+        return None
+    words = [word for word in title.replace(':', ' ').split() if word[0].isalnum()]
+    aliases = [''.join(word[0] for word in words).upper()]
+    if ':' in title:
+        aliases.append(title.split(':', 1)[1].strip())
+    return '\n'.join(aliases)
+
+def _ref(kind, item_id, name, abbreviation=None):
+    ref = {
+        'api_detail_url': f'https://www.giantbomb.com/api/{kind}/{3045 if kind == "platform" else 3060}-{item_id}/',
+        'id': item_id,
+        'name': name,
+        'site_detail_url': f'https://www.giantbomb.com/{name.lower().replace(" ", "-")}/'
+    }
+    if abbreviation:
+        ref['abbreviation'] = abbreviation
+    return ref
+
+def generate_game(rng, index):
+    """One Giant Bomb-shaped game payload"""
+    title = _title(rng)
+    stem = f'{rng.randint(0, 9)}/{rng.randint(1000, 99999)}/{rng.randint(100000, 3999999)}-{index}.jpg'
+    released = datetime(1985, 1, 1) + timedelta(days=rng.randint(0, 14000))
+    platforms = rng.sample(PLATFORMS, rng.choice([1, 1, 2, 3, 4]))
+    genres = rng.sample(GENRES, rng.choice([1, 1, 2]))
+    return {
+        'guid': f'3030-{index}',
+        'id': index,
+        'name': title,
+        'aliases': _aliases(rng, title),
+        'deck': f'{title} is a game about {rng.choice(WORDS).lower()}s.',
+        'description': None,
+        'original_release_date': released.strftime('%Y-%m-%d'),
+        'image': {
+            'icon_url': f'https://www.giantbomb.com/a/uploads/square_avatar/{stem}',
+            'medium_url': f'https://www.giantbomb.com/a/uploads/scale_medium/{stem}',
+            'screen_url': f'https://www.giantbomb.com/a/uploads/screen_medium/{stem}',
+            'screen_large_url': f'https://www.giantbomb.com/a/uploads/screen_kubrick/{stem}',
+            'small_url': f'https://www.giantbomb.com/a/uploads/scale_small/{stem}',
+            'super_url': f'https://www.giantbomb.com/a/uploads/scale_large/{stem}',
+            'thumb_url': f'https://www.giantbomb.com/a/uploads/scale_avatar/{stem}',
+            'tiny_url': f'https://www.giantbomb.com/a/uploads/square_mini/{stem}',
+        },
+        'platforms': [_ref('platform', *platform) for platform in platforms],
+        'genres': [_ref('genre', *genre) for genre in genres],
+        'site_detail_url': f'https://www.giantbomb.com/games/3030-{index}/',
+        'api_detail_url': f'https://www.giantbomb.com/api/game/3030-{index}/',
+        'number_of_user_reviews': rng.randint(0, 20),
+        'date_added': '2008-04-01 01:32:48',
+        'date_last_updated': '2020-01-07 16:31:43',
+    }
+
+def generate_catalog(count, seed=42, start=1):
+    """Yield `count` synthetic game payloads deterministically for a given seed"""
+    rng = random.Random(seed)
+    for index in range(start, start + count):
+        yield generate_game(rng, index)
@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+"""
+Migration script to populate the game_tags table and games.release_year
+for games cached before faceted browsing was added.
+The table and column themselves are created on app startup.
+"""
+
+import sys
+import os
+
+# Add the server directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import create_app
+from app.commands import backfill_game_tags
+
+def migrate_database():
+    """Backfill normalized tags for all existing games"""
+    app = create_app()
+    
+    with app.app_context():
+        backfill_game_tags.main(args=[], standalone_mode=False)
+
+if __name__ == '__main__':
+    migrate_database()
@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+"""
+Migration script to fill the user_library_stats table for libraries created
+before per-user stats were maintained. The table itself is created on app
+startup; the same command repairs drift later (flask rebuild-library-stats).
+"""
+
+import sys
+import os
+
+# Add the server directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import create_app
+from app.commands import rebuild_library_stats
+
+def migrate_database():
+    """Compute library stats for every user"""
+    app = create_app()
+    
+    with app.app_context():
+        rebuild_library_stats.main(args=sys.argv[1:], standalone_mode=False)
+
+if __name__ == '__main__':
+    migrate_database()
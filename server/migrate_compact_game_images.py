@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""
+Migration script to convert the eight per-size image URL columns on games
+to the compact image_path / image_overrides representation, in chunks.
+The new columns are added on app startup; pass --drop-columns to drop the
+legacy games URL columns and user_games.image_url afterwards.
+"""
+
+import sys
+import os
+
+# Add the server directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import create_app
+from app.commands import compact_game_images
+
+def migrate_database():
+    """Convert image URLs for every existing game"""
+    app = create_app()
+    
+    with app.app_context():
+        compact_game_images.main(args=sys.argv[1:], standalone_mode=False)
+
+if __name__ == '__main__':
+    migrate_database()
@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+"""
+Migration script to move game descriptions out of the games table into the
+compressed game_descriptions table, in chunks. The new table is created on
+app startup; pass --drop-column to drop games.description afterwards.
+"""
+
+import sys
+import os
+
+# Add the server directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import create_app
+from app.commands import move_game_descriptions
+
+def migrate_database():
+    """Move every legacy description into game_descriptions"""
+    app = create_app()
+    
+    with app.app_context():
+        move_game_descriptions.main(args=sys.argv[1:], standalone_mode=False)
+
+if __name__ == '__main__':
+    migrate_database()
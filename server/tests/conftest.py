@@ -0,0 +1,61 @@
+"""
+Shared fixtures: an app on a throwaway SQLite database and an authenticated
+test client
+"""
+
+import os
+import sys
+
+import pytest
+from sqlalchemy import event
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    monkeypatch.setenv('DATABASE_URL', f"sqlite:///{tmp_path / 'test.db'}")
+    from app import create_app, db
+    app = create_app()
+    app.config['TESTING'] = True
+    with app.app_context():
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+
+@pytest.fixture
+def make_user(app):
+    """Create a user and return (user id, test client logged in as them)"""
+    from flask_jwt_extended import create_access_token
+    from app import db
+    from app.models import User
+
+    def make_user(username):
+        user = User(username=username, email=f'{username}@example.com', first_name='Test', last_name='User')
+        user.set_password('Passw0rd!x')
+        db.session.add(user)
+        db.session.commit()
+        client = app.test_client()
+        client.set_cookie('access_token', create_access_token(identity=str(user.id)))
+        return user.id, client
+
+    return make_user
+
+@pytest.fixture
+def count_statements(app):
+    """count_statements(fn) -> (SQL statements fn executed, fn's return value)"""
+    from app import db
+
+    def count_statements(fn):
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', record)
+        try:
+            result = fn()
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record)
+        return len(statements), result
+
+    return count_statements
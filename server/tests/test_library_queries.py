@@ -0,0 +1,58 @@
+"""
+Library views must run a fixed number of queries however many games a user
+owns (no per-row lazy loads of the game)
+"""
+
+import pytest
+
+from app import db
+from app.models import Game, UserGame, UserLibraryStats
+
+PLATFORMS = [{'id': 157, 'name': 'Nintendo Switch', 'abbreviation': 'NSW'}]
+STATUSES = ['want_to_play', 'playing', 'completed', 'dropped']
+
+def add_library(user_id, size, first_game_id):
+    games = [
+        Game(
+            id=game_id, guid=f'3030-{game_id}', name=f'Game {game_id}', deck='deck',
+            image_path=f'8/82063/{game_id}-box.jpg', platforms=PLATFORMS
+        )
+        for game_id in range(first_game_id, first_game_id + size)
+    ]
+    db.session.add_all(games)
+    db.session.flush()
+    db.session.add_all([
+        UserGame(user_id=user_id, game_id=game.id, status=STATUSES[index % len(STATUSES)], rating=index % 10 + 1)
+        for index, game in enumerate(games)
+    ])
+    db.session.flush()
+    UserLibraryStats.rebuild([user_id])
+    db.session.commit()
+
+@pytest.fixture
+def libraries(make_user):
+    small_id, small_client = make_user('small')
+    large_id, large_client = make_user('large')
+    add_library(small_id, 10, 1)
+    add_library(large_id, 300, 1001)
+    return {'small': (small_id, small_client, 10), 'large': (large_id, large_client, 300)}
+
+def test_library_query_count_is_independent_of_size(libraries, count_statements):
+    counts = {}
+    for name, (user_id, client, size) in libraries.items():
+        counts[name], response = count_statements(lambda: client.get('/api/games/library?limit=200'))
+        assert response.status_code == 200
+        assert len(response.get_json()['library']) == min(size, 200)
+    assert counts['small'] == counts['large']
+    assert counts['small'] <= 4
+
+def test_profile_query_count_is_independent_of_size(libraries, count_statements):
+    counts = {}
+    for name, (user_id, client, size) in libraries.items():
+        counts[name], response = count_statements(lambda: client.get(f'/api/users/{user_id}'))
+        assert response.status_code == 200
+        body = response.get_json()
+        assert len(body['library']) == size
+        assert body['stats']['total_games'] == size
+    assert counts['small'] == counts['large']
+    assert counts['small'] <= 10